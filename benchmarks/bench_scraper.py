@@ -0,0 +1,522 @@
+# AapkaRojgar Tools - Offline Benchmarks
+#
+# Times every phase of a scraper cycle with no network or API access: link
+# discovery, article extraction, boilerplate stripping, TF-IDF grouping,
+# consolidation, LLM extraction through FakeBackend, dedup/insert into the
+# content store, commit and archiving, search index build/update/queries,
+# plus one whole run_automation_cycle() served from a replayed corpus. Pages come from recorded fixtures (`--record`
+# snapshots the live links.txt sources into benchmarks/fixtures/) or from a
+# synthetic generator that mimics the mirrors' markup at any size; data.json
+# files of growing size are generated the same way. Each phase is run
+# `--repeat` times for timings and once more under tracemalloc for peak
+# memory, and the results are printed (or written) as JSON.
+#
+#   python benchmarks/bench_scraper.py --sizes 10,100,1000 --data-sizes 1000,10000 -o bench.json
+#   python benchmarks/bench_scraper.py --record --per-source 20
+#   python benchmarks/bench_scraper.py --fixtures benchmarks/fixtures --phases article_parse,grouping
+#   python benchmarks/bench_scraper.py --phases search_build,search_update,search_query --search-sizes 50000
+
+import argparse
+import contextlib
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scraper  # noqa: E402
+from boilerplate import BoilerplateLearner  # noqa: E402
+from content_store import ARCHIVE_KEY, CATEGORIES, empty_data, write_json_atomic  # noqa: E402
+from extraction import ExtractionExecutor, FakeBackend  # noqa: E402
+from fetcher import FetchResult  # noqa: E402
+from grouping import group_articles  # noqa: E402
+from html_parsing import available_backends  # noqa: E402
+from search_index import BROTLI_QUALITY, SearchIndex, ShardedSearchIndex, build_search_index, phonetic_key, tokenize  # noqa: E402
+from site_build import write_shards  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+MANIFEST_NAME = 'manifest.json'
+ARTICLE_PHASES = ['discovery', 'article_parse', 'boilerplate', 'grouping', 'consolidation', 'llm_extraction', 'cycle']
+STORE_PHASES = ['store_load', 'dedup_insert', 'store_commit', 'archive_reindex', 'archive_run']
+SEARCH_PHASES = ['search_build', 'search_update', 'search_query', 'search_query_sharded']
+SEARCH_QUERIES = ['ssc', 'constable', 'police constable', 'bssc bihar', 'up police bharti', 'bharati', 'rrb technician',
+                  'junior engineer', 'const', 'stenographer', 'indian navy', 'teacher recruitment', 'multi tasking staff',
+                  'admit card', 'lab assistant haryana', 'sarkari naukri', 'clerk ibps', 'notification', 'online form', 'sub insp']
+
+SYNTHETIC_HOSTS = ['https://www.mirror-one.example', 'https://mirror-two.example', 'https://www.mirror-three.example']
+ORGANIZATIONS = ['SSC', 'UPSSSC', 'BSSC Bihar', 'RRB', 'IBPS', 'UP Police', 'Indian Navy', 'DSSSB', 'HSSC', 'MPESB']
+POSTS = ['Constable', 'Junior Engineer', 'Clerk', 'Stenographer', 'Teacher', 'Sub Inspector', 'Technician',
+         'Assistant Officer', 'Multi Tasking Staff', 'Lab Assistant']
+KINDS = ['Recruitment', 'Online Form', 'Vacancy', 'Notification', 'Bharti']
+STATES = ['Uttar Pradesh', 'Bihar', 'Madhya Pradesh', 'Haryana', 'Delhi', 'Rajasthan', 'All India']
+HOST_CHROME = [
+    ['Join our Telegram channel for instant Sarkari job alerts every day',
+     'Disclaimer: please verify every detail on the official website before applying'],
+    ['Follow us on WhatsApp for the latest notification updates and results',
+     'Bookmark this page and press Ctrl+D to get every new vacancy first'],
+    ['Download our Android app for free government job alerts in Hindi',
+     'Share this post with your friends who are preparing for exams'],
+]
+# Made-up words give every post its own vocabulary, so TF-IDF groups only true mirror copies.
+SYLLABLES = ['ka', 'ra', 'pur', 'ga', 'dha', 'ni', 'sha', 'van', 'ti', 'lo', 'ma', 'der', 'bad', 'sin', 'gh', 'nag']
+
+
+@contextlib.contextmanager
+def quiet():
+    # The scraper narrates every link and group; keep that out of the timings and the report.
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull): yield
+
+
+def percentile(samples, fraction):
+    if not samples: return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+def timed_each(func, items):
+    latencies = []
+    for item in items:
+        started = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run_phase(name, size, setup, body, repeat):
+    """setup() -> state (untimed); body(state) -> {'items': n, 'latencies': [s, ...] or None, ...extra}."""
+    wall, latencies, outcome = [], [], {}
+    for _ in range(repeat):
+        state = setup()
+        with quiet():
+            started = time.perf_counter()
+            outcome = body(state)
+            wall.append(time.perf_counter() - started)
+        latencies.extend(outcome.get('latencies') or [])
+    # Memory gets its own pass so tracemalloc's overhead never skews the timings.
+    state = setup()
+    tracemalloc.start()
+    with quiet(): body(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    seconds, items = statistics.median(wall), outcome.get('items', 0)
+    samples = latencies or wall
+    result = {'phase': name, 'size': size, 'items': items, 'repeat': repeat, 'seconds': round(seconds, 6),
+              'throughput_per_s': round(items / seconds, 2) if seconds else None,
+              'latency_per': 'item' if latencies else 'run',
+              'p50_ms': _ms(percentile(samples, 0.50)), 'p95_ms': _ms(percentile(samples, 0.95)),
+              'peak_memory_kb': peak // 1024}
+    result.update({key: value for key, value in outcome.items() if key not in ('items', 'latencies')})
+    print(f"  -> {name} [{size}]: {items} item(s) in {seconds:.3f}s, p50 {result['p50_ms']}ms, "
+          f"p95 {result['p95_ms']}ms, peak {result['peak_memory_kb']} KiB", file=sys.stderr)
+    return result
+
+
+# --- Corpora ---
+class ReplayEngine:
+    """FetchEngine stand-in that serves recorded or generated pages from memory."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def fetch(self, url, headers=None):
+        self.requests += 1
+        content = self.pages.get(url)
+        if content is None: return FetchResult(url, error=LookupError(f"no fixture for {url}"))
+        return FetchResult(url, content, 200, {})
+
+    def submit(self, url, headers=None):
+        future = Future()
+        future.set_result(self.fetch(url, headers))
+        return future
+
+    def fetch_all(self, urls, headers_for=None):
+        return [self.fetch(url) for url in urls]
+
+
+def _made_up_words(rng, count):
+    return ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(count))
+
+
+def synthetic_post(i, year):
+    rng = random.Random(i)
+    organization = ORGANIZATIONS[i % len(ORGANIZATIONS)]
+    post = POSTS[(i // len(ORGANIZATIONS)) % len(POSTS)]
+    kind = KINDS[(i // (len(ORGANIZATIONS) * len(POSTS))) % len(KINDS)]
+    vacancies = rng.randint(50, 9000)
+    title = f"{organization} {post} {kind} {year} for {vacancies} Posts"
+    return {'index': i, 'title': title, 'slug': f"{scraper.generate_slug(title)}-{i}", 'organization': organization,
+            'post': post, 'vacancies': vacancies, 'state': rng.choice(STATES), 'start': date(year, 1, 1) + timedelta(days=rng.randint(0, 300)),
+            'words': [_made_up_words(rng, 12) for _ in range(4)]}
+
+
+def synthetic_article_html(post, host_index):
+    top_chrome, bottom_chrome = HOST_CHROME[host_index % len(HOST_CHROME)]
+    last_date = post['start'] + timedelta(days=30)
+    related = ''.join(f'<li><a href="/related-{n}/">{ORGANIZATIONS[n]} {POSTS[n]} Recruitment Updates</a></li>' for n in range(5))
+    paragraphs = ''.join(f"<p>{post['organization']} {post['post']} {words}.</p>" for words in post['words'])
+    return f"""<!DOCTYPE html><html><head><title>{post['title']}</title><style>body{{font-family:sans-serif}}</style>
+<script>window.dataLayer = window.dataLayer || [];</script></head><body>
+<header><nav><a href="/">Home</a><a href="/latest-jobs/">Latest Jobs</a><a href="/admit-card/">Admit Card</a></nav></header>
+<div class="post-content"><h1>{post['title']}</h1>
+<p>{top_chrome}</p>
+<p>{post['organization']} has released the {post['post']} notification (Advt No. {post['index']}/{post['start'].year}) for {post['vacancies']} posts in {post['state']}.</p>
+{paragraphs}
+<table><tr><th>Event</th><th>Date</th></tr>
+<tr><td>Application Start</td><td>{post['start']:%d %B %Y}</td></tr>
+<tr><td>Last Date</td><td>{last_date:%d %B %Y}</td></tr>
+<tr><td>Total Posts</td><td>{post['vacancies']}</td></tr></table>
+<ul>{related}</ul>
+<p><a href="/apply/{post['slug']}/">Apply Online</a> | <a href="/pdf/{post['slug']}.pdf">Download Notification</a> |
+<a href="https://{post['organization'].lower().replace(' ', '')}.example.gov.in/">Official Website</a></p>
+<p>{bottom_chrome}</p></div>
+<aside><a href="/privacy/">Privacy Policy</a></aside><footer>Copyright {post['start'].year}</footer></body></html>"""
+
+
+def synthetic_listing_html(links):
+    anchors = ''.join(f'<li><a href="{href}">{title}</a></li>\n' for title, href in links)
+    return f"""<!DOCTYPE html><html><body><nav><a href="/">Sarkari Result</a><a href="/latest-jobs/">Latest Jobs</a>
+<a href="/result/">Result</a><a href="/admit-card/">Admit Card</a></nav><div class="box"><ul>
+{anchors}</ul></div><footer><a href="/privacy/">Privacy Policy</a></footer></body></html>"""
+
+
+def synthetic_corpus(article_count, year=None):
+    """{'listings': {url: html bytes}, 'articles': {url: html bytes}}; every 4th post is mirrored on a second host."""
+    year = year or datetime.now().year
+    listings, articles = {}, {}
+    links = {host: [] for host in SYNTHETIC_HOSTS}
+    i = 0
+    while len(articles) < article_count:
+        post = synthetic_post(i, year)
+        hosts = [i % len(SYNTHETIC_HOSTS)] + ([(i + 1) % len(SYNTHETIC_HOSTS)] if i % 4 == 0 else [])
+        for host_index in hosts[:article_count - len(articles)]:
+            host = SYNTHETIC_HOSTS[host_index]
+            articles[f"{host}/{post['slug']}/"] = synthetic_article_html(post, host_index).encode('utf-8')
+            links[host].append((post['title'], f"/{post['slug']}/"))
+        i += 1
+    for host, host_links in links.items():
+        if host_links: listings[f"{host}/"] = synthetic_listing_html(host_links).encode('utf-8')
+    return {'listings': listings, 'articles': articles}
+
+
+def load_fixtures(fixtures_dir):
+    with open(os.path.join(fixtures_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f: manifest = json.load(f)
+    corpus = {'listings': {}, 'articles': {}}
+    for kind in corpus:
+        for url, filename in manifest.get(kind, {}).items():
+            with open(os.path.join(fixtures_dir, filename), 'rb') as f: corpus[kind][url] = f.read()
+    return corpus
+
+
+def record_fixtures(fixtures_dir, per_source):
+    """Snapshot the live links.txt sources and up to per_source of their article pages."""
+    manifest = {'recorded': datetime.now().isoformat(timespec='seconds'), 'listings': {}, 'articles': {}}
+    os.makedirs(os.path.join(fixtures_dir, 'pages'), exist_ok=True)
+
+    def save_page(kind, url, content):
+        filename = f"pages/{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html"
+        with open(os.path.join(fixtures_dir, filename), 'wb') as f: f.write(content)
+        manifest[kind][url] = filename
+
+    website_urls = scraper.read_urls_from_file(os.path.join(ROOT, scraper.URL_FILE))
+    with scraper.create_fetch_engine() as engine:
+        for url, result in zip(website_urls, engine.fetch_all(website_urls)):
+            if not result.ok: print(f"  -> Skipping {url}: {result.error}"); continue
+            save_page('listings', url, result.content)
+            with quiet(): article_urls = [link['url'] for link in scraper.parse_listing_page(url, result.content, set())][:per_source]
+            for article_url, article_result in zip(article_urls, engine.fetch_all(article_urls)):
+                if article_result.ok: save_page('articles', article_url, article_result.content)
+    write_json_atomic(os.path.join(fixtures_dir, MANIFEST_NAME), manifest, indent=2, ensure_ascii=False)
+    print(f"  -> Recorded {len(manifest['listings'])} listing(s) and {len(manifest['articles'])} article(s) into {fixtures_dir}.")
+
+
+def synthetic_data(post_count, today=None):
+    """A data.json with post_count posts spread over every category, ~10% archived, dates around today."""
+    today = today or datetime.now().date()
+    rng = random.Random(post_count)
+    data = empty_data()
+    for i in range(post_count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        post = synthetic_post(i, today.year)
+        when = today + timedelta(days=rng.randint(-400, 120))
+        item = {'type': category, 'id': f"{post['slug']}-{category}", 'title': post['title'],
+                'last_date': when.isoformat() if category in ('latest_jobs', 'admission') else None,
+                'creation_date': (when - timedelta(days=30)).isoformat(), 'new': rng.random() < 0.2,
+                'details': {'post_name': f"{post['organization']} {post['post']} {post['start'].year}",
+                            'post_subtitle': post['organization'], 'description': ' '.join(post['words'])}}
+        if category == 'admit_card': item['details']['admit_card_summary'] = {'Exam Date': f"{when:%d %B %Y}"}
+        if category == 'answer_key':
+            item['details']['answer_key_summary'] = {'Objection Window': f"{when - timedelta(days=3):%d %b %Y} to {when:%d %b %Y}"}
+        if i % 10 == 9: data[ARCHIVE_KEY].setdefault(category, []).append(item)
+        else: data[category].append(item)
+    return data
+
+
+# --- Phases ---
+class Workdir:
+    """A scratch directory the scraper's relative file names (data.json, llm_cache, ...) resolve into."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def fresh(self, name):
+        path = os.path.join(self.root, name)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        os.chdir(path)
+        return path
+
+
+def fake_executor(fake_latency):
+    return ExtractionExecutor(FakeBackend(latency=fake_latency), scraper.CUSTOM_PROMPT, max_concurrency=scraper.GEMINI_MAX_CONCURRENCY,
+                              requests_per_minute=0, max_retries=0)
+
+
+def parsed_articles(corpus):
+    with quiet():
+        return [{'title': url, 'url': url, 'source': url, 'content': scraper.parse_article_page(url, html)}
+                for url, html in corpus['articles'].items()]
+
+
+def stripped_articles(corpus):
+    articles, boilerplate = parsed_articles(corpus), BoilerplateLearner(os.devnull)
+    for article in articles: boilerplate.observe(article['url'], article['content'])
+    for article in articles: article['content'] = boilerplate.strip(article['url'], article['content'])
+    return articles, boilerplate
+
+
+def consolidate(groups, boilerplate):
+    contents = []
+    for group in groups:
+        content = "IMPORTANT CONTEXT: Today's date is 2000-01-01.\n\n"
+        for article, article_content in zip(group, boilerplate.fit_group(group, scraper.GROUP_TOKEN_BUDGET)):
+            content += f"\n--- Source: {article['url']} ---\n\n{article_content}"
+        contents.append(content)
+    return contents
+
+
+def bench_articles(corpus, label, args, workdir, selected):
+    results, article_count = [], len(corpus['articles'])
+    def phase(name, setup, body):
+        if name in selected: results.append(run_phase(name, label, setup, body, args.repeat))
+
+    def discover(listings):
+        links = []
+        latencies = timed_each(lambda item: links.extend(scraper.parse_listing_page(item[0], item[1], set())), listings)
+        return {'items': len(listings), 'latencies': latencies, 'links_found': len(links)}
+    phase('discovery', lambda: list(corpus['listings'].items()), discover)
+
+    phase('article_parse', lambda: list(corpus['articles'].items()),
+          lambda pages: {'items': len(pages), 'latencies': timed_each(lambda item: scraper.parse_article_page(*item), pages)})
+
+    def strip_all(state):
+        articles, boilerplate = state
+        for article in articles: boilerplate.observe(article['url'], article['content'])
+        latencies = timed_each(lambda article: boilerplate.strip(article['url'], article['content']), articles)
+        saved = sum(totals['saved'] for totals in boilerplate.savings.values())
+        return {'items': len(articles), 'latencies': latencies, 'bytes_saved': saved}
+    if 'boilerplate' in selected: base_articles = parsed_articles(corpus)
+    phase('boilerplate', lambda: ([dict(article) for article in base_articles], BoilerplateLearner(os.devnull)), strip_all)
+
+    needs_groups = {'grouping', 'consolidation', 'llm_extraction'} & selected
+    if needs_groups:
+        with quiet(): articles, boilerplate = stripped_articles(corpus)
+        groups = group_articles(articles, scraper.GROUPING_SIMILARITY_THRESHOLD)
+    phase('grouping', lambda: articles,
+          lambda state: {'items': len(state), 'groups': len(group_articles(state, scraper.GROUPING_SIMILARITY_THRESHOLD))})
+
+    phase('consolidation', lambda: groups,
+          lambda state: {'items': len(state), 'latencies': timed_each(lambda group: consolidate([group], boilerplate), state)})
+
+    def extract(state):
+        executor, contents, latencies = state[0], state[1], []
+        def timed_extract(content, extract=executor.extract):
+            started = time.perf_counter()
+            result = extract(content)
+            latencies.append(time.perf_counter() - started)
+            return result
+        executor.extract = timed_extract  # extract_all() maps self.extract, so the instance attribute wins.
+        results = executor.extract_all(contents)
+        return {'items': len(contents), 'latencies': latencies, 'valid': sum(1 for result in results if result.entry),
+                'concurrency': executor.max_concurrency, 'fake_latency_s': args.fake_latency}
+    if 'llm_extraction' in selected:
+        with quiet(): contents = consolidate(groups, boilerplate)
+    phase('llm_extraction', lambda: (fake_executor(args.fake_latency), contents), extract)
+
+    def cycle_setup():
+        workdir.fresh('cycle')
+        with open(scraper.URL_FILE, 'w', encoding='utf-8') as f: f.write('\n'.join(corpus['listings']) + '\n')
+        write_json_atomic(scraper.DATA_JSON_FILE, synthetic_data(args.cycle_data_size), indent=2, ensure_ascii=False)
+        pages = dict(corpus['listings'], **corpus['articles'])
+        scraper.create_fetch_engine = lambda: ReplayEngine(pages)
+        scraper._extraction_executor = fake_executor(args.fake_latency)
+    def cycle(_):
+        scraper.run_automation_cycle()
+        with open(scraper.DATA_JSON_FILE, 'r', encoding='utf-8') as f: data = json.load(f)
+        return {'items': article_count, 'posts_after': sum(len(data.get(category, [])) for category in CATEGORIES),
+                'data_json_posts': args.cycle_data_size}
+    phase('cycle', cycle_setup, cycle)
+    return results
+
+
+def bench_store(post_count, args, workdir, selected):
+    results, data = [], synthetic_data(post_count)
+    def phase(name, setup, body):
+        if name in selected: results.append(run_phase(name, post_count, setup, body, args.repeat))
+    workdir.fresh(f"store-{post_count}")
+    write_json_atomic(scraper.DATA_JSON_FILE, data, indent=2, ensure_ascii=False)
+    with quiet(): scraper.load_content_store()  # Builds and saves expiry_index.json once, outside the timings.
+    data_bytes = os.path.getsize(scraper.DATA_JSON_FILE)
+    # One cycle's worth of model output, a tenth of it colliding with ids already published.
+    existing_ids = [item['id'] for category in CATEGORIES for item in data[category]]
+    batch = [{'type': 'job', 'id': f"bench-new-{n}", 'title': f"Bench Post {n}", 'last_date': None, 'new': True, 'details': {}}
+             for n in range(args.insert_batch)]
+    for n in range(0, len(batch), 10):
+        if existing_ids: batch[n] = dict(batch[n], id=existing_ids[n % len(existing_ids)])
+
+    def load_store():
+        with quiet(): return scraper.load_content_store()
+
+    phase('store_load', lambda: None, lambda _: (scraper.load_content_store(), {'items': post_count, 'data_json_bytes': data_bytes})[1])
+
+    def dedup_insert(store):
+        def insert(entry):
+            if entry['id'] not in store: store.insert('latest_jobs', dict(entry))
+        latencies = timed_each(insert, batch)
+        return {'items': len(batch), 'latencies': latencies, 'inserted': store.inserted}
+    phase('dedup_insert', load_store, dedup_insert)
+
+    def dirty_store():
+        with open(scraper.DATA_JSON_FILE + '.bak', 'wb') as f, open(scraper.DATA_JSON_FILE, 'rb') as src: f.write(src.read())
+        store = load_store()
+        for entry in batch:
+            if entry['id'] not in store: store.insert('latest_jobs', dict(entry))
+        return store
+    def commit(store):
+        store.commit()
+        os.replace(scraper.DATA_JSON_FILE + '.bak', scraper.DATA_JSON_FILE)  # Every repetition commits onto the same file.
+        return {'items': post_count}
+    phase('store_commit', dirty_store, commit)
+
+    phase('archive_reindex', load_store, lambda store: (scraper.rebuild_expiry_index(store), {'items': post_count})[1])
+
+    def archive(store):
+        scraper.run_archiving_process(scraper.DATA_JSON_FILE, store)
+        return {'items': post_count, 'archived': store.archived}
+    phase('archive_run', load_store, archive)
+    return results
+
+
+def bench_search(post_count, args, workdir, selected):
+    results, data = [], synthetic_data(post_count)
+    def phase(name, setup, body):
+        if name in selected: results.append(run_phase(name, post_count, setup, body, args.repeat))
+    directory = os.path.join(workdir.fresh(f"search-{post_count}"), 'search')
+    with quiet(): index = build_search_index(data, directory)
+
+    def cold_data():
+        tokenize.cache_clear(); phonetic_key.cache_clear()
+        return data
+    phase('search_build', cold_data, lambda state: (SearchIndex.from_data(state), {'items': post_count})[1])
+
+    # One cycle's changes: a batch of new posts and a few archive moves, written over the existing shards.
+    changed = {category: list(items) for category, items in data.items() if isinstance(items, list)}
+    changed[ARCHIVE_KEY] = {category: list(items) for category, items in data[ARCHIVE_KEY].items()}
+    changed['latest_jobs'][:0] = [dict(item, id=f"{item['id']}-new") for item in synthetic_data(args.insert_batch)['latest_jobs']]
+    moved, changed['admit_card'] = changed['admit_card'][:10], changed['admit_card'][10:]
+    changed[ARCHIVE_KEY].setdefault('admit_card', [])[:0] = moved
+    def base_index():
+        with quiet(): build_search_index(data, directory)
+    def update(_):
+        shards = SearchIndex.from_data(changed, numbers=ShardedSearchIndex(directory).doc_numbers()).render()
+        written, removed = write_shards(shards, directory, label='Search index', brotli_quality=BROTLI_QUALITY)
+        return {'items': post_count, 'shards_written': written, 'shards_removed': removed, 'shards_total': len(shards)}
+    phase('search_update', base_index, update)
+
+    def run_queries(searchable):
+        hits = []
+        latencies = timed_each(lambda query: hits.append(len(searchable.search(query))), SEARCH_QUERIES)
+        return {'items': len(SEARCH_QUERIES), 'latencies': latencies, 'mean_hits': round(sum(hits) / len(hits), 1)}
+    phase('search_query', lambda: index, run_queries)
+    phase('search_query_sharded', lambda: (base_index(), ShardedSearchIndex(directory))[1], run_queries)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the scraper pipeline.")
+    parser.add_argument('--sizes', default='10,100,1000', help="Comma-separated synthetic article counts (up to 10000).")
+    parser.add_argument('--data-sizes', default='1000,10000', help="Comma-separated data.json post counts.")
+    parser.add_argument('--search-sizes', default='50000', help="Comma-separated post counts for the search index phases.")
+    parser.add_argument('--fixtures', help=f"Replay recorded pages from this directory (see --record) instead of synthetic ones.")
+    parser.add_argument('--record', action='store_true', help=f"Fetch the live links.txt sources into {FIXTURES_DIR} and exit.")
+    parser.add_argument('--per-source', type=int, default=20, help="Article pages to record per listing page.")
+    parser.add_argument('--phases', help=f"Comma-separated subset of: {', '.join(ARTICLE_PHASES + STORE_PHASES + SEARCH_PHASES)}.")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fake-latency', type=float, default=0.0, help="Seconds FakeBackend sleeps per call, to model API latency.")
+    parser.add_argument('--insert-batch', type=int, default=100, help="Entries inserted per dedup_insert/store_commit run.")
+    parser.add_argument('--cycle-data-size', type=int, default=1000, help="Posts in data.json before the end-to-end cycle.")
+    parser.add_argument('-o', '--output', help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args(argv)
+    if args.record: record_fixtures(args.fixtures or FIXTURES_DIR, args.per_source); return
+
+    selected = set(args.phases.split(',')) if args.phases else set(ARTICLE_PHASES + STORE_PHASES + SEARCH_PHASES)
+    unknown = selected - set(ARTICLE_PHASES + STORE_PHASES + SEARCH_PHASES)
+    if unknown: parser.error(f"unknown phase(s): {', '.join(sorted(unknown))}")
+    report = {'meta': {'started': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                       'platform': platform.platform(), 'parser_backend': scraper.PARSER_BACKEND,
+                       'available_backends': available_backends(), 'repeat': args.repeat,
+                       'corpus': 'fixtures' if args.fixtures else 'synthetic'}, 'results': []}
+    original_cwd, original_engine = os.getcwd(), scraper.create_fetch_engine
+    workdir = Workdir(tempfile.mkdtemp(prefix='scraper-bench-'))
+    try:
+        if selected & set(ARTICLE_PHASES):
+            if args.fixtures:
+                corpus = load_fixtures(args.fixtures)
+                report['results'] += bench_articles(corpus, f"fixtures:{len(corpus['articles'])}", args, workdir, selected)
+            else:
+                for size in (int(size) for size in args.sizes.split(',') if size):
+                    report['results'] += bench_articles(synthetic_corpus(size), size, args, workdir, selected)
+        if selected & set(STORE_PHASES):
+            for post_count in (int(size) for size in args.data_sizes.split(',') if size):
+                report['results'] += bench_store(post_count, args, workdir, selected)
+        if selected & set(SEARCH_PHASES):
+            for post_count in (int(size) for size in args.search_sizes.split(',') if size):
+                report['results'] += bench_search(post_count, args, workdir, selected)
+    finally:
+        os.chdir(original_cwd)
+        scraper.create_fetch_engine, scraper._extraction_executor = original_engine, None
+        shutil.rmtree(workdir.root, ignore_errors=True)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: f.write(output + '\n')
+        print(f"  -> Wrote {len(report['results'])} result(s) to {args.output}.", file=sys.stderr)
+    else: print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# AapkaRojgar Tools - Boilerplate Learner & Prompt Budget
+#
+# Mirror sites repeat the same chrome on every post: related-post lists, share
+# widgets, "join our Telegram" blocks. The learner counts, per host, how many
+# pages each (normalised) line appears on; a line seen on enough pages of the
+# same host is treated as template text and stripped before grouping and
+# consolidation. Counts persist in one JSON file between runs; once a host
+# has more than window_pages pages, save() scales its page and line counts
+# back down to the window together, so a changed template is learned within
+# about one window of pages however long the host has been scraped. fit_group()
+# then drops lines repeated across the articles of one group and trims the
+# group to a token budget. Savings are tallied per source for report().
+
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit
+
+CHARS_PER_TOKEN = 4  # Rough estimate for English/Hinglish prose; only used for budgeting and reports.
+LINKS_MARKER = "\n\n--- EXTRACTED LINKS ---\n"
+TRUNCATION_NOTE = "[... trimmed to fit the prompt budget ...]"
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def source_host(url):
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _line_key(line):
+    return hashlib.blake2b(' '.join(line.lower().split()).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _is_protected(line):
+    # Section markers we emit ourselves must never be learned as template text.
+    return line.startswith('--- ')
+
+
+class BoilerplateLearner:
+    def __init__(self, path, min_pages=3, min_ratio=0.6, min_line_chars=20, max_lines_per_host=5000, window_pages=200):
+        self.path = path
+        self.min_pages, self.min_ratio = min_pages, min_ratio
+        self.min_line_chars = min_line_chars
+        self.window_pages = window_pages
+        self.max_lines_per_host = max_lines_per_host
+        self.hosts = {}
+        self.savings = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f: self.hosts = json.load(f).get('hosts', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def _candidate_lines(self, text):
+        return {line.strip() for line in text.splitlines() if len(line.strip()) >= self.min_line_chars and not _is_protected(line.strip())}
+
+    def observe(self, url, text):
+        """Count each distinct candidate line of one page towards its host's statistics."""
+        state = self.hosts.setdefault(source_host(url), {'pages': 0, 'lines': {}})
+        state['pages'] += 1
+        for line in self._candidate_lines(text):
+            key = _line_key(line)
+            state['lines'][key] = state['lines'].get(key, 0) + 1
+
+    def is_boilerplate(self, host, line):
+        state = self.hosts.get(host)
+        if not state or len(line) < self.min_line_chars or _is_protected(line): return False
+        count = state['lines'].get(_line_key(line), 0)
+        return count >= self.min_pages and count >= self.min_ratio * state['pages']
+
+    def _record(self, url, before, after, raw=False):
+        totals = self.savings.setdefault(source_host(url), {'raw': 0, 'saved': 0})
+        if raw: totals['raw'] += len(before.encode('utf-8'))
+        totals['saved'] += len(before.encode('utf-8')) - len(after.encode('utf-8'))
+
+    def strip(self, url, text):
+        host = source_host(url)
+        kept = [line for line in text.splitlines() if not self.is_boilerplate(host, line.strip())]
+        stripped = '\n'.join(kept)
+        self._record(url, text, stripped, raw=True)
+        return stripped
+
+    def fit_group(self, articles, token_budget):
+        """Return the group's contents with cross-article duplicate lines removed, trimmed to token_budget.
+
+        Only long lines already seen in an earlier article are dropped; short ones are mostly table cells
+        (the 100/50/20 of two vacancy rows) that legitimately repeat.
+        """
+        earlier_lines, contents = set(), []
+        for article in articles:
+            lines = article['content'].splitlines()
+            contents.append('\n'.join(line for line in lines if line.strip() not in earlier_lines))
+            earlier_lines.update(self._candidate_lines(article['content']))
+        contents = self._trim_to_budget(contents, token_budget)
+        for article, content in zip(articles, contents): self._record(article['url'], article['content'], content)
+        return contents
+
+    def _trim_to_budget(self, contents, token_budget):
+        if not token_budget or sum(estimate_tokens(c) for c in contents) <= token_budget: return contents
+        # Water-filling: small articles keep everything, the rest share what is left equally.
+        caps, remaining, open_indices = {}, token_budget, sorted(range(len(contents)), key=lambda i: estimate_tokens(contents[i]))
+        while open_indices:
+            share = remaining // len(open_indices)
+            index = open_indices[0]
+            if estimate_tokens(contents[index]) > share: break
+            caps[index] = estimate_tokens(contents[index])
+            remaining -= caps[index]
+            open_indices.pop(0)
+        for index in open_indices: caps[index] = remaining // len(open_indices)
+        return [self._truncate(content, caps[i]) for i, content in enumerate(contents)]
+
+    def _truncate(self, content, token_cap):
+        if estimate_tokens(content) <= token_cap: return content
+        body, marker, links = content.partition(LINKS_MARKER)
+        # Keep the extracted links whole; they feed the post's important_links.
+        body_chars = max(0, (token_cap - estimate_tokens(marker + links)) * CHARS_PER_TOKEN)
+        return body[:body_chars].rsplit('\n', 1)[0] + '\n' + TRUNCATION_NOTE + marker + links
+
+    def _decay(self, state):
+        if state['pages'] <= self.window_pages: return
+        scale = self.window_pages / state['pages']
+        state['pages'] = self.window_pages
+        # Lines that fall under half a page are too rare to matter and would only grow the file.
+        state['lines'] = {key: round(count * scale, 3) for key, count in state['lines'].items() if count * scale >= 0.5}
+
+    def save(self):
+        for state in self.hosts.values():
+            self._decay(state)
+            if len(state['lines']) > self.max_lines_per_host:
+                # Lines first counted this run sit at the end; on equal counts keep them over older ones.
+                newest_first = reversed(list(state['lines'].items()))
+                top = sorted(newest_first, key=lambda item: item[1], reverse=True)[:self.max_lines_per_host]
+                state['lines'] = dict(top)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'hosts': self.hosts}, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        for host, totals in sorted(self.savings.items()):
+            percent = (totals['saved'] / totals['raw'] * 100) if totals['raw'] else 0.0
+            print(f"  -> Prompt savings for {host}: {totals['saved']} of {totals['raw']} bytes "
+                  f"(~{totals['saved'] // CHARS_PER_TOKEN} tokens, {percent:.0f}%).")
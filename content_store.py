@@ -0,0 +1,116 @@
+# AapkaRojgar Tools - In-Memory Content Store
+#
+# data.json is loaded once per cycle and indexed by post id across every
+# category, archived ones included, so duplicate checks are a dict lookup.
+# Inserts and archive moves only touch memory; commit() writes the file once,
+# through a temp file and os.replace(), so a crash can never leave the site's
+# only data file half written. The store keeps a digest of the bytes it last
+# read or wrote, so sidecar indexes can tell whether they describe this file.
+
+import hashlib
+import json
+import os
+
+CATEGORIES = ["latest_jobs", "result", "admit_card", "answer_key", "syllabus", "admission", "upcoming_jobs", "important_documents"]
+ARCHIVE_KEY = "archived_content"
+
+
+def empty_data():
+    data = {category: [] for category in CATEGORIES}
+    data[ARCHIVE_KEY] = {}
+    return data
+
+
+def content_digest(payload):
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def write_bytes_atomic(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    write_bytes_atomic(path, json.dumps(data, **dump_kwargs).encode('utf-8'))
+
+
+class ContentStore:
+    def __init__(self, path, on_commit=None, on_insert=None):
+        self.path = path
+        self.on_commit = on_commit
+        self.on_insert = on_insert
+        self.dirty = False
+        self.inserted, self.archived = 0, 0
+        self.digest = None  # content_digest() of data.json as last read or written; None if it didn't load.
+        try:
+            with open(path, 'rb') as f: raw = f.read()
+            self.data = json.loads(raw)
+            self.digest = content_digest(raw)
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+            print(f"Warning: {path} not found/invalid. Creating new.")
+            self.data = empty_data()
+        self.data.setdefault(ARCHIVE_KEY, {})
+        self.index, self.items_by_id = {}, {}
+        for category, items in self._sections():
+            for item in items: self._index_item(item, category)
+
+    def _sections(self):
+        # Active categories first so an id present in both resolves to its live copy.
+        for category, items in self.data.items():
+            if category != ARCHIVE_KEY and isinstance(items, list): yield category, items
+        for category, items in self.data[ARCHIVE_KEY].items():
+            if isinstance(items, list): yield f"{ARCHIVE_KEY}.{category}", items
+
+    def _index_item(self, item, location):
+        post_id = item.get('id') if isinstance(item, dict) else None
+        if post_id and post_id not in self.index:
+            self.index[post_id] = location
+            self.items_by_id[post_id] = item
+
+    def __contains__(self, post_id):
+        return post_id in self.index
+
+    def location(self, post_id):
+        """'latest_jobs' for a live post, 'archived_content.latest_jobs' for an archived one, else None."""
+        return self.index.get(post_id)
+
+    def get(self, post_id):
+        return self.items_by_id.get(post_id)
+
+    def items(self, category):
+        return self.data.get(category, [])
+
+    def insert(self, category, entry):
+        if entry.get('id') in self.index: return False
+        self.data.setdefault(category, []).insert(0, entry)
+        self._index_item(entry, category)
+        self.inserted += 1
+        self.dirty = True
+        if self.on_insert: self.on_insert(category, entry)
+        return True
+
+    def archive(self, category, items_to_archive):
+        """Move items out of an active category to the front of its archive list."""
+        if not items_to_archive: return
+        moving = {id(item) for item in items_to_archive}
+        self.data[category] = [item for item in self.data.get(category, []) if id(item) not in moving]
+        archive_list = self.data[ARCHIVE_KEY].setdefault(category, [])
+        self.data[ARCHIVE_KEY][category] = list(items_to_archive) + archive_list
+        for item in items_to_archive:
+            if isinstance(item, dict) and item.get('id'): self.index[item['id']] = f"{ARCHIVE_KEY}.{category}"
+        self.archived += len(items_to_archive)
+        self.dirty = True
+
+    def commit(self):
+        if not self.dirty: return False
+        payload = json.dumps(self.data, indent=2, ensure_ascii=False).encode('utf-8')
+        write_bytes_atomic(self.path, payload)
+        self.digest = content_digest(payload)
+        print(f"  -> SUCCESS: {self.path} has been updated ({self.inserted} inserted, {self.archived} archived).")
+        self.dirty, self.inserted, self.archived = False, 0, 0
+        if self.on_commit: self.on_commit(self.data)
+        return True
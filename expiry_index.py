@@ -0,0 +1,71 @@
+# AapkaRojgar Tools - Expiry Index
+#
+# Each post's archive date is computed once, when it is inserted, and kept in
+# a min-heap of (archive_on, category, id). Archiving then only pops the
+# entries that are due instead of re-parsing every date in data.json. The heap
+# is persisted as a sorted JSON list (one entry per line, so git diffs stay
+# small); a sorted list is already a valid heap, so loading needs no work.
+# Entries are never removed eagerly: whoever pops one checks that the post is
+# still live in that category.
+#
+# The file also records the digest of the data.json it was saved against.
+# data.json is written first, so a crash before the index is saved (or any
+# write that bypasses the content store) leaves a stale digest, and the
+# caller rebuilds the index instead of silently never archiving new posts.
+
+import heapq
+import json
+import os
+
+
+class ExpiryIndex:
+    def __init__(self, path):
+        self.path = path
+        self.heap = []
+        self.source_digest = None  # Digest of the data.json this index was saved against.
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f: saved = json.load(f)
+            # Indexes from before the digest was recorded are a bare list; they never match and get rebuilt.
+            if isinstance(saved, dict):
+                self.heap = [tuple(entry) for entry in saved['entries']]
+                self.source_digest = saved.get('source_digest')
+            heapq.heapify(self.heap)
+        except (FileNotFoundError, json.JSONDecodeError, TypeError, KeyError):
+            self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def clear(self):
+        self.heap = []
+        self.dirty = True
+
+    def schedule(self, category, post_id, archive_on):
+        if archive_on is None or not post_id: return
+        heapq.heappush(self.heap, (archive_on.isoformat(), category, post_id))
+        self.dirty = True
+
+    def pop_due(self, today):
+        """Remove and return [(category, post_id)] for every entry whose archive date is before today."""
+        cutoff, due = today.isoformat(), []
+        while self.heap and self.heap[0][0] < cutoff:
+            _, category, post_id = heapq.heappop(self.heap)
+            due.append((category, post_id))
+        if due: self.dirty = True
+        return due
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def matches(self, source_digest):
+        return source_digest is not None and self.source_digest == source_digest
+
+    def save(self, source_digest):
+        if not self.dirty and self.source_digest == source_digest: return
+        entries = ',\n'.join(json.dumps(list(entry), ensure_ascii=False) for entry in sorted(self.heap))
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f'{{"source_digest": {json.dumps(source_digest)},\n"entries": [\n{entries}\n]}}\n')
+        os.replace(tmp_path, self.path)
+        self.source_digest, self.dirty = source_digest, False
@@ -0,0 +1,204 @@
+# AapkaRojgar Tools - LLM Extraction Executor
+#
+# Runs the consolidated groups through the model several at a time, under a
+# requests-per-minute budget, with jittered exponential backoff for quota and
+# transient server errors. The model itself sits behind a tiny backend
+# interface (generate(prompt) -> text), so the real Gemini client is created
+# once per process and a FakeBackend can stand in for it offline. An optional
+# LLMResultCache answers repeated inputs without calling the backend at all.
+# Errors count as transient only by exception type or numeric status code,
+# never by message text: a 400 whose message mentions "500 tokens" is
+# permanent. DeferralLedger caps how many cycles a group's links can be
+# deferred for after transient failures, so one bad prompt can't be re-sent
+# forever.
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_cache import cache_key
+
+TRANSIENT_ERROR_NAMES = {'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError',
+                         'DeadlineExceeded', 'GatewayTimeout', 'Aborted', 'RetryError', 'ConnectionError', 'Timeout'}
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GeminiBackend:
+    def __init__(self, api_key, model_name):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt):
+        return self.model.generate_content(prompt).text
+
+
+class FakeBackend:
+    """Deterministic stand-in for offline runs: answers every prompt with a minimal valid 'job' entry."""
+
+    def __init__(self, responder=None, latency=0.0):
+        self.name = 'fake'
+        self.responder = responder
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt):
+        with self._lock: self.calls += 1
+        if self.latency: time.sleep(self.latency)
+        if self.responder: return self.responder(prompt)
+        article = prompt.split('--- ARTICLE CONTENT ---', 1)[-1]
+        digest = hashlib.sha1(article.encode('utf-8')).hexdigest()[:12]
+        source = re.search(r'--- Source: (\S+) ---', article)
+        title = source.group(1).rstrip('/').rsplit('/', 1)[-1].replace('-', ' ').title() if source else 'Fake Post'
+        return json.dumps({"type": "job", "id": f"fake-{digest}", "title": title, "last_date": None, "new": True,
+                           "details": {"post_name": title, "post_subtitle": "Generated by FakeBackend"}})
+
+
+def parse_model_json(raw_response_text):
+    json_match = re.search(r'\{.*\}', raw_response_text, re.DOTALL)
+    if not json_match: return None
+    try:
+        return json.loads(json_match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def is_transient_error(error):
+    if type(error).__name__ in TRANSIENT_ERROR_NAMES or isinstance(error, (TimeoutError, ConnectionError)): return True
+    # google.api_core errors carry the HTTP status as .code (gRPC errors have a .code() method instead, which is skipped).
+    code = getattr(error, 'code', None)
+    if code is None or callable(code): code = getattr(error, 'status_code', None)
+    try:
+        return int(code) in TRANSIENT_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+class RateLimiter:
+    """Sliding one-minute window shared by all worker threads."""
+
+    def __init__(self, requests_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.requests_per_minute: return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= 60: self._sent.popleft()
+                if len(self._sent) < self.requests_per_minute:
+                    self._sent.append(now)
+                    return
+                wait = 60 - (now - self._sent[0])
+            time.sleep(wait)
+
+
+class DeferralLedger:
+    """How many cycles each article URL has been deferred for after transient model errors, persisted as JSON."""
+
+    def __init__(self, path, max_deferrals=3, max_age_days=30):
+        self.path = path
+        self.max_deferrals = max_deferrals
+        self.max_age_seconds = max_age_days * 86400
+        self.urls = {}
+        self._dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f: self.urls = json.load(f).get('urls', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def defer(self, urls):
+        """Count one more deferral for every URL; False once any of them has used up max_deferrals."""
+        now = int(time.time())
+        for url in urls: self.urls[url] = {'count': self.urls.get(url, {}).get('count', 0) + 1, 'last': now}
+        self._dirty = True
+        return all(self.urls[url]['count'] <= self.max_deferrals for url in urls)
+
+    def forget(self, urls):
+        for url in urls:
+            if self.urls.pop(url, None) is not None: self._dirty = True
+
+    def save(self):
+        cutoff = time.time() - self.max_age_seconds
+        stale = [url for url, state in self.urls.items() if state['last'] < cutoff]
+        self.forget(stale)
+        if not self._dirty: return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f: json.dump({'urls': self.urls}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+class ExtractionResult:
+    def __init__(self, entry=None, raw_response=None, error=None, transient=False, attempts=0, cached=False, elapsed=0.0):
+        self.entry = entry
+        self.cached = cached
+        self.elapsed = elapsed  # Seconds spent in the last backend call.
+        self.raw_response = raw_response
+        self.error = error
+        self.transient = transient
+        self.attempts = attempts
+
+
+class ExtractionExecutor:
+    def __init__(self, backend, prompt, max_concurrency=4, requests_per_minute=15, max_retries=4, base_delay=2.0, max_delay=60.0, cache=None):
+        self.backend = backend
+        self.cache = cache
+        self.prompt = prompt
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.max_retries = max_retries
+        self.base_delay, self.max_delay = base_delay, max_delay
+
+    def _backoff(self, attempt):
+        # "Full jitter": uniform in [0, min(cap, base * 2^attempt)] spreads out retries from parallel workers.
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def extract(self, content):
+        key = cache_key(content, self.prompt, self.backend.name) if self.cache else None
+        if key:
+            cached_entry = self.cache.get(key)
+            if cached_entry is not None:
+                print(f"  -> LLM cache hit ({key[:12]}). Skipping API call.")
+                return ExtractionResult(cached_entry, cached=True)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            attempt += 1
+            started = time.perf_counter()
+            try:
+                print(f"  -> Contacting {self.backend.name} (attempt {attempt})...")
+                raw_response_text = self.backend.generate(self.prompt + content).strip()
+            except Exception as e:
+                transient = is_transient_error(e)
+                if transient and attempt <= self.max_retries:
+                    delay = self._backoff(attempt)
+                    print(f"  -> Transient error from {self.backend.name}: {e}. Retrying in {delay:.1f}s.")
+                    time.sleep(delay)
+                    continue
+                print(f"  -> FATAL ERROR with {self.backend.name}: {e}")
+                return ExtractionResult(raw_response=f"Error: {e}", error=e, transient=transient, attempts=attempt,
+                                        elapsed=time.perf_counter() - started)
+            entry = parse_model_json(raw_response_text)
+            if entry is None:
+                print("  -> ERROR: No valid JSON object in AI response."); print("  -> Raw Response:", raw_response_text)
+            elif key and isinstance(entry, dict):
+                self.cache.put(key, entry)
+            return ExtractionResult(entry, raw_response_text, attempts=attempt, elapsed=time.perf_counter() - started)
+
+    def extract_all(self, contents):
+        """Extract every consolidated text concurrently; results come back in input order."""
+        contents = list(contents)
+        if not contents: return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(contents))) as pool:
+            return list(pool.map(self.extract, contents))
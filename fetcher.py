@@ -0,0 +1,124 @@
+# AapkaRojgar Tools - Concurrent Fetch Engine
+#
+# A bounded thread pool on top of one shared requests.Session. Connections are
+# kept alive per host, each host gets its own concurrency cap and politeness
+# delay, and fetch_all() always returns results in the order URLs were given,
+# so the grouping phase sees the same corpus no matter which request finished
+# first. submit() queues a single fetch and returns its Future, so callers can
+# start follow-up requests while others are in flight.
+#
+# The per-host cap is applied before work reaches the pool: each host has a
+# FIFO queue, and a URL is handed to a worker only when its host has a free
+# slot. A worker therefore never sits blocked behind a busy host while
+# requests to other hosts wait.
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+
+class FetchResult:
+    def __init__(self, url, content=None, status_code=None, headers=None, error=None, elapsed=0.0):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None and self.content is not None
+
+
+class FetchEngine:
+    def __init__(self, max_workers=8, max_per_host=2, host_delay=0.5, timeout=15, headers=None):
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        self.host_delay = max(0.0, host_delay)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._host_active = {}   # host -> requests handed to the pool and not yet finished
+        self._host_waiting = {}  # host -> deque of (url, headers, future) waiting for a slot
+        self._host_next_time = {}
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            # URLs still waiting for a host slot will never be handed to the pool now.
+            for waiting in self._host_waiting.values():
+                for _, _, future in waiting: future.cancel()
+                waiting.clear()
+        if self._pool: self._pool.shutdown(wait=True)
+        self.session.close()
+
+    def _wait_for_turn(self, host):
+        # Reserve the next politeness window for this host, then sleep outside the lock.
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._host_next_time.get(host, now))
+            self._host_next_time[host] = start_at + self.host_delay
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def _get(self, host, url, headers):
+        self._wait_for_turn(host)
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+            if response.status_code == 304:
+                return FetchResult(url, b'', 304, response.headers, elapsed=time.perf_counter() - started)
+            response.raise_for_status()
+            return FetchResult(url, response.content, response.status_code, response.headers, elapsed=time.perf_counter() - started)
+        except requests.RequestException as e:
+            return FetchResult(url, error=e, elapsed=time.perf_counter() - started)
+
+    def _run(self, host, url, headers, future):
+        try:
+            if future.set_running_or_notify_cancel(): future.set_result(self._get(host, url, headers))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            # Hand this host's slot straight to its next waiting URL, if any.
+            with self._lock:
+                waiting = self._host_waiting.get(host)
+                if waiting: self._pool.submit(self._run, host, *waiting.popleft())
+                else: self._host_active[host] -= 1
+
+    def submit(self, url, headers=None):
+        """Queue one fetch; the Future resolves to its FetchResult. Hosts at their cap queue in FIFO order."""
+        host, future = urlsplit(url).netloc.lower(), Future()
+        with self._lock:
+            if self._pool is None: self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            if self._host_active.get(host, 0) < self.max_per_host:
+                self._host_active[host] = self._host_active.get(host, 0) + 1
+                self._pool.submit(self._run, host, url, headers, future)
+            else:
+                self._host_waiting.setdefault(host, deque()).append((url, headers, future))
+        return future
+
+    def fetch(self, url, headers=None):
+        return self.submit(url, headers).result()
+
+    def fetch_all(self, urls, headers_for=None):
+        """Fetch every URL concurrently; results come back in input order."""
+        futures = [self.submit(url, headers_for(url) if headers_for else None) for url in urls]
+        return [future.result() for future in futures]
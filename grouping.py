@@ -0,0 +1,135 @@
+# AapkaRojgar Tools - Near-Duplicate Grouping Engine
+#
+# Articles are grouped as the connected components of the "TF-IDF cosine >
+# threshold" graph, exactly like the old dense BFS, but the graph is built from
+# blocked sparse products and merged with union-find, so memory stays bounded
+# by the number of real neighbours instead of n². A MinHash/LSH fingerprint
+# index remembers which source texts already became posts, and on which host,
+# so a repost on another mirror is recognised before it reaches Gemini. Pages
+# from the same host are never matched: a site's admit card or result page for
+# an exam reuses most of its recruitment page, but it is a new post.
+
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            # Keep the smaller index as root so components are labelled by their first member.
+            if root_j < root_i: root_i, root_j = root_j, root_i
+            self.parent[root_j] = root_i
+
+
+def similar_pairs(tfidf_matrix, threshold, block_size=256):
+    """Yield (i, j) with i < j for every pair of L2-normalised rows whose cosine exceeds threshold."""
+    n = tfidf_matrix.shape[0]
+    transposed = tfidf_matrix.T.tocsc()
+    for start in range(0, n, block_size):
+        block = (tfidf_matrix[start:start + block_size] @ transposed).tocoo()
+        keep = block.data > threshold
+        for row, col in zip(block.row[keep] + start, block.col[keep]):
+            if row < col: yield int(row), int(col)
+
+
+def group_articles(articles, threshold, block_size=256):
+    """Group article dicts by content similarity; groups and members keep input order."""
+    if len(articles) < 2: return [list(articles)] if articles else []
+    tfidf_matrix = TfidfVectorizer(stop_words='english').fit_transform([meta['content'] for meta in articles]).tocsr()
+    components = UnionFind(len(articles))
+    for i, j in similar_pairs(tfidf_matrix, threshold, block_size):
+        components.union(i, j)
+    groups = {}
+    for idx in range(len(articles)):
+        groups.setdefault(components.find(idx), []).append(articles[idx])
+    return [groups[root] for root in sorted(groups)]
+
+
+# --- MinHash fingerprints for repost detection ---
+_HASH_PRIME = 4294967291  # Largest prime below 2**32.
+_WORD_RE = re.compile(r'\w+')
+
+
+class FingerprintIndex:
+    def __init__(self, path, num_perm=64, bands=16, threshold=0.9, shingle_size=3, max_entries=5000):
+        self.path = path
+        self.num_perm, self.bands = num_perm, bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        generator = np.random.RandomState(1)
+        # a < 2**29 and hashes < 2**32 keep a*h + b inside uint64 before the modulo.
+        self._a = generator.randint(1, 1 << 29, size=num_perm).astype(np.uint64)
+        self._b = generator.randint(0, 1 << 29, size=num_perm).astype(np.uint64)
+        self.entries = []
+        self._buckets = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"  -> WARN: Ignoring unreadable fingerprint index {self.path}: {e}"); return
+        if data.get('num_perm') != self.num_perm: return
+        for entry in data.get('entries', []): self._index(entry)
+
+    def _band_keys(self, signature):
+        step = self.rows_per_band
+        return [(band, tuple(signature[band * step:(band + 1) * step])) for band in range(self.bands)]
+
+    def _index(self, entry):
+        position = len(self.entries)
+        self.entries.append(entry)
+        for key in self._band_keys(entry['sig']): self._buckets.setdefault(key, []).append(position)
+
+    def signature(self, text):
+        tokens = _WORD_RE.findall(text.lower())
+        size = self.shingle_size
+        shingles = {' '.join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % np.uint64(_HASH_PRIME)
+        return [int(value) for value in permuted.min(axis=1)]
+
+    def match(self, signature, host):
+        """Return (post_id, estimated Jaccard) of the closest post from another host above threshold, else (None, 0.0)."""
+        candidates = set()
+        for key in self._band_keys(signature): candidates.update(self._buckets.get(key, ()))
+        best_id, best_score = None, 0.0
+        for position in candidates:
+            entry = self.entries[position]
+            # Entries written before hosts were recorded can't prove they came from another mirror.
+            if entry.get('host') in (None, host): continue
+            score = sum(1 for x, y in zip(signature, entry['sig']) if x == y) / self.num_perm
+            if score >= self.threshold and score > best_score: best_id, best_score = entry['id'], score
+        return best_id, best_score
+
+    def add(self, post_id, signature, host):
+        self._index({'id': post_id, 'host': host, 'sig': signature})
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty: return
+        entries = self.entries[-self.max_entries:]
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'num_perm': self.num_perm, 'entries': entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
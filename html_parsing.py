@@ -0,0 +1,84 @@
+# AapkaRojgar Tools - HTML Parsing Backends
+#
+# Listing pages only need (text, href) for every <a href>, so they go through
+# the cheapest path available: selectolax's lexbor CSS engine when installed,
+# otherwise BeautifulSoup restricted to anchors with a SoupStrainer. Article
+# pages still need the full tree; they use BeautifulSoup on lxml when it is
+# installed and fall back to the stock html.parser.
+#
+# The fast backends repair markup differently from html.parser (a nested <a>
+# is closed early, cutting its text short, and CRLF inside link text becomes
+# LF), so 'auto' is opt-in and the scraper defaults to html.parser. lxml and
+# selectolax are only needed for PARSER_BACKEND = 'auto'; the workflow does
+# not install them.
+# tests/test_html_parsing.py compares the backends on the pages in
+# tests/fixtures/; run `python html_parsing.py page.html ...` to check more
+# recorded pages.
+
+import sys
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup tree builder)
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+ANCHOR_STRAINER = SoupStrainer('a', href=True)
+
+
+def available_backends():
+    backends = ['html.parser']
+    if HAS_LXML: backends.insert(0, 'lxml')
+    if SelectolaxParser: backends.insert(0, 'selectolax')
+    return backends
+
+
+def _tree_builder(backend):
+    if backend in ('auto', 'selectolax', 'lxml') and HAS_LXML: return 'lxml'
+    return 'html.parser'
+
+
+def parse_document(html_content, backend='auto'):
+    """Full BeautifulSoup tree for article pages."""
+    return BeautifulSoup(html_content, _tree_builder(backend))
+
+
+def iter_anchors(html_content, backend='auto'):
+    """Yield (stripped link text, raw href) for every <a href> in document order."""
+    if backend in ('auto', 'selectolax') and SelectolaxParser:
+        for node in SelectolaxParser(html_content).css('a[href]'):
+            yield node.text(deep=True, separator='', strip=True), node.attributes.get('href') or ''
+        return
+    soup = BeautifulSoup(html_content, _tree_builder(backend), parse_only=ANCHOR_STRAINER)
+    for link in soup.find_all('a', href=True):
+        yield link.get_text(strip=True), link['href']
+
+
+def compare_backends(html_content):
+    """Return {backend: first mismatching (index, expected, got)} against html.parser; empty if all agree."""
+    expected = list(iter_anchors(html_content, 'html.parser'))
+    mismatches = {}
+    for backend in available_backends():
+        got = list(iter_anchors(html_content, backend))
+        if got != expected:
+            index = next((i for i, (a, b) in enumerate(zip(expected, got)) if a != b), min(len(expected), len(got)))
+            mismatches[backend] = (index, expected[index] if index < len(expected) else None, got[index] if index < len(got) else None)
+    return mismatches
+
+
+if __name__ == "__main__":
+    print(f"Available backends: {', '.join(available_backends())}")
+    failed = 0
+    for path in sys.argv[1:]:
+        with open(path, 'rb') as f: mismatches = compare_backends(f.read())
+        for backend, (index, expected, got) in mismatches.items():
+            failed += 1
+            print(f"  -> MISMATCH {path} [{backend}] anchor #{index}: expected {expected!r}, got {got!r}")
+    print("All backends agree." if not failed else f"{failed} mismatch(es).")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,86 @@
+# AapkaRojgar Tools - Conditional-Request Response Cache
+#
+# Remembers the ETag / Last-Modified validators and a body hash for every source
+# page we poll. The next run sends If-None-Match / If-Modified-Since, and a 304
+# or a byte-identical body means the page can be skipped without parsing. The
+# whole cache is one minified JSON file so it can be committed next to
+# seen_urls.txt by the Actions workflow.
+
+import hashlib
+import json
+import os
+import time
+
+
+class ResponseCache:
+    NOT_MODIFIED, UNCHANGED, CHANGED = 'not_modified', 'unchanged', 'changed'
+
+    def __init__(self, path, max_entries=500):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = {}
+        self.totals = {}
+        self.stats = {'requests': 0, 'not_modified': 0, 'unchanged': 0, 'changed': 0, 'evicted': 0}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: data = json.load(f)
+            self.entries = data.get('entries', {})
+            self.totals = data.get('totals', {})
+        except (json.JSONDecodeError, OSError, AttributeError) as e:
+            print(f"  -> WARN: Ignoring unreadable response cache {self.path}: {e}")
+            self.entries, self.totals = {}, {}
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url)
+        if not entry: return {}
+        headers = {}
+        if entry.get('etag'): headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'): headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def check(self, url, result):
+        """Classify a successful fetch and remember its validators for the next run."""
+        self.stats['requests'] += 1
+        entry = self.entries.get(url)
+        if result.status_code == 304 and entry:
+            status = self.NOT_MODIFIED
+        else:
+            body_hash = hashlib.sha256(result.content).hexdigest()[:32]
+            status = self.UNCHANGED if entry and entry.get('hash') == body_hash else self.CHANGED
+            entry = {'hash': body_hash}
+            if result.headers.get('ETag'): entry['etag'] = result.headers['ETag']
+            if result.headers.get('Last-Modified'): entry['last_modified'] = result.headers['Last-Modified']
+        entry['used'] = int(time.time())
+        self.entries[url] = entry
+        self.stats[status] += 1
+        self._evict()
+        return status
+
+    def forget(self, url):
+        self.entries.pop(url, None)
+
+    def _evict(self):
+        overflow = len(self.entries) - self.max_entries
+        if overflow <= 0: return
+        for url, _ in sorted(self.entries.items(), key=lambda item: item[1].get('used', 0))[:overflow]:
+            del self.entries[url]
+        self.stats['evicted'] += overflow
+
+    def save(self):
+        for key, value in self.stats.items():
+            self.totals[key] = self.totals.get(key, 0) + value
+        payload = {'entries': self.entries, 'totals': self.totals}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.stats = {key: 0 for key in self.stats}
+
+    def report(self):
+        skipped = self.stats['not_modified'] + self.stats['unchanged']
+        print(f"  -> Response cache: {self.stats['requests']} source page(s), {self.stats['not_modified']} not modified (304), "
+              f"{self.stats['unchanged']} unchanged body, {self.stats['changed']} changed; skipped parsing {skipped}. "
+              f"{len(self.entries)} cached entries, {self.stats['evicted']} evicted.")
@@ -0,0 +1,111 @@
+# AapkaRojgar Tools - Content-Addressed LLM Result Cache
+#
+# Parsed model entries are stored under a hash of the normalised consolidated
+# text, the prompt and the model name. The "Today's date is ..." context line
+# is dropped before hashing so the same articles hit on any day, and the
+# "--- Source: <url> ---" lines are blanked and the source hosts stripped from
+# every link, so the same text copied to another mirror hits too. Each entry is
+# its own small file (diff-friendly when committed); index.json keeps the
+# created/last-used times that drive age and LRU eviction.
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+DATE_CONTEXT_RE = re.compile(r"^.*Today's date is .*$", re.MULTILINE)
+SOURCE_LINE_RE = re.compile(r'^--- Source: (\S+) ---$', re.MULTILINE)
+URL_HOST_RE = re.compile(r'https?://([^/\s"\']+)', re.IGNORECASE)
+INDEX_NAME = 'index.json'
+
+
+def _host(authority):
+    host = authority.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def normalize_content(content):
+    content = DATE_CONTEXT_RE.sub('', content)
+    # Links into the mirror itself (relative hrefs resolved against the page) differ only by host; official links keep theirs.
+    source_hosts = {_host(match.group(1)) for url in SOURCE_LINE_RE.findall(content) for match in [URL_HOST_RE.match(url)] if match}
+    content = SOURCE_LINE_RE.sub('--- Source ---', content)
+    content = URL_HOST_RE.sub(lambda match: 'source:' if _host(match.group(1)) in source_hosts else match.group(0), content)
+    lines = (' '.join(line.split()) for line in content.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def cache_key(content, prompt, model_name):
+    digest = hashlib.sha256()
+    for part in (model_name, prompt, normalize_content(content)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class LLMResultCache:
+    def __init__(self, cache_dir, max_entries=300, max_age_days=30):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self.index = {}
+        try:
+            with open(os.path.join(cache_dir, INDEX_NAME), 'r', encoding='utf-8') as f: self.index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            meta = self.index.get(key)
+            if meta and time.time() - meta['created'] <= self.max_age_seconds:
+                try:
+                    with open(self._entry_path(key), 'r', encoding='utf-8') as f: entry = json.load(f)
+                    meta['used'] = int(time.time())
+                    self.stats['hits'] += 1
+                    return entry
+                except (FileNotFoundError, json.JSONDecodeError):
+                    self.index.pop(key, None)
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key, entry):
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._entry_path(key)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f: json.dump(entry, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+            now = int(time.time())
+            self.index[key] = {'created': now, 'used': now}
+            self.stats['stores'] += 1
+
+    def _evict(self):
+        cutoff = time.time() - self.max_age_seconds
+        expired = [key for key, meta in self.index.items() if meta['created'] < cutoff]
+        expired_keys = set(expired)
+        by_use = sorted((key for key in self.index if key not in expired_keys), key=lambda key: self.index[key]['used'])
+        overflow = by_use[:max(0, len(by_use) - self.max_entries)]
+        for key in expired + overflow:
+            del self.index[key]
+            if os.path.exists(self._entry_path(key)): os.remove(self._entry_path(key))
+        self.stats['evicted'] += len(expired) + len(overflow)
+
+    def save(self):
+        with self._lock:
+            self._evict()
+            if not self.index and not os.path.isdir(self.cache_dir): return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            index_path = os.path.join(self.cache_dir, INDEX_NAME)
+            with open(index_path + '.tmp', 'w', encoding='utf-8') as f: json.dump(self.index, f, separators=(',', ':'), sort_keys=True)
+            os.replace(index_path + '.tmp', index_path)
+
+    def report(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups else 0.0
+        print(f"  -> LLM cache: {self.stats['hits']}/{lookups} hits ({hit_rate:.0f}%), {self.stats['stores']} stored, "
+              f"{self.stats['evicted']} evicted, {len(self.index)} entries.")
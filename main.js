@@ -1,3 +1,15 @@
+// Load a prebuilt data shard (written by site_build.py), falling back to the full data.json
+const fetchDataShard = async (shardPath, fromMasterData) => {
+    try {
+        const response = await fetch(`data/${shardPath}`);
+        if (response.ok) return await response.json();
+    } catch (error) {
+        console.warn(`Could not load data/${shardPath}, falling back to data.json`, error);
+    }
+    const response = await fetch('data.json');
+    return fromMasterData(await response.json());
+};
+
 // Function to fetch and inject HTML content
 const includeHTML = async (elementId, filePath) => {
     try {
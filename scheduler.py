@@ -0,0 +1,87 @@
+# AapkaRojgar Tools - Adaptive Source Scheduler
+#
+# Each listing page in links.txt gets its own polling interval instead of one
+# global sleep. After every successful poll the source's new-link rate
+# (links per hour) is folded into an exponentially weighted moving average and
+# the next interval is chosen so that a poll is expected to find about
+# target_links_per_poll new links, clamped to [min_interval, max_interval].
+# Busy sources are polled often, quiet ones drift towards max_interval.
+# Failed polls back off exponentially from the current interval, up to
+# max_backoff. State persists in one JSON file so a restart keeps every
+# source's history and due time.
+
+import json
+import time
+from datetime import datetime
+
+from content_store import write_json_atomic
+
+
+class SourceScheduler:
+    def __init__(self, path, default_interval=3600, min_interval=900, max_interval=6 * 3600, max_backoff=24 * 3600,
+                 target_links_per_poll=1.0, smoothing=0.3, due_slack=600):
+        self.path = path
+        self.default_interval = default_interval
+        self.min_interval, self.max_interval, self.max_backoff = min_interval, max_interval, max_backoff
+        self.target_links_per_poll = target_links_per_poll
+        self.smoothing = smoothing
+        self.due_slack = due_slack  # Sources due within this many seconds are polled together.
+        self.sources = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f: self.sources = json.load(f).get('sources', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def sync(self, urls, now=None):
+        """Track exactly the given sources, in their links.txt order; new ones are due immediately."""
+        now = int(now or time.time())
+        self.sources = {url: self.sources.get(url) or {'interval': self.default_interval, 'rate_per_hour': None, 'failures': 0,
+                                                       'polls': 0, 'new_links': 0, 'last_polled': None, 'next_due': now}
+                        for url in urls}
+
+    def due(self, now=None):
+        # links.txt order, not due time: earlier sources win ties between mirrors later in the cycle.
+        horizon = (now or time.time()) + self.due_slack
+        return [url for url, state in self.sources.items() if state['next_due'] <= horizon]
+
+    def seconds_until_due(self, now=None):
+        if not self.sources: return self.default_interval
+        return max(0, min(state['next_due'] for state in self.sources.values()) - (now or time.time()))
+
+    def _adaptive_interval(self, rate_per_hour):
+        if not rate_per_hour: return self.max_interval
+        return int(min(self.max_interval, max(self.min_interval, self.target_links_per_poll / rate_per_hour * 3600)))
+
+    def _polled(self, state, now, delay):
+        state['last_polled'], state['next_due'] = int(now), int(now + delay)
+        state['polls'] += 1
+
+    def record_success(self, url, new_links, now=None):
+        now, state = now or time.time(), self.sources[url]
+        hours = ((now - state['last_polled']) if state['last_polled'] else state['interval']) / 3600
+        observed = new_links / max(hours, 1 / 60)
+        previous = state['rate_per_hour']
+        state['rate_per_hour'] = round(observed if previous is None else self.smoothing * observed + (1 - self.smoothing) * previous, 4)
+        state['new_links'] += new_links
+        state['failures'] = 0
+        state['interval'] = self._adaptive_interval(state['rate_per_hour'])
+        self._polled(state, now, state['interval'])
+
+    def record_failure(self, url, now=None):
+        now, state = now or time.time(), self.sources[url]
+        state['failures'] += 1
+        self._polled(state, now, min(self.max_backoff, state['interval'] * 2 ** state['failures']))
+
+    def poll_soon(self, url, now=None):
+        """Bring a source forward to min_interval, e.g. when its links were deferred to a later poll."""
+        state = self.sources[url]
+        state['next_due'] = min(state['next_due'], int((now or time.time()) + self.min_interval))
+
+    def save(self):
+        write_json_atomic(self.path, {'sources': self.sources}, indent=2, sort_keys=True)
+
+    def report(self):
+        for url, state in sorted(self.sources.items(), key=lambda item: item[1]['next_due']):
+            due_at = datetime.fromtimestamp(state['next_due']).strftime('%Y-%m-%d %H:%M')
+            failures = f", {state['failures']} failure(s)" if state['failures'] else ""
+            print(f"  -> {url}: every {state['interval'] // 60} min, {state['rate_per_hour'] or 0:.2f} new links/h{failures}, next at {due_at}.")
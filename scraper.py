@@ -1,28 +1,66 @@
 # AapkaRojgar Tools - Automated JSON Content Scraper (V33.1 - Final Correction)
 
-import requests
-from bs4 import BeautifulSoup
 import time
 import os
 import re
-import json
-import shutil
-import google.generativeai as genai
+import argparse
+from functools import lru_cache
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 from dateutil.parser import parse as date_parser
 from urllib.parse import urljoin
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from fetcher import FetchEngine
+from http_cache import ResponseCache
+from grouping import FingerprintIndex, group_articles
+from site_build import build_static_shards
+from content_store import ContentStore
+from extraction import DeferralLedger, ExtractionExecutor, FakeBackend, GeminiBackend
+from llm_cache import LLMResultCache
+from seen_store import SeenUrlStore
+from html_parsing import iter_anchors, parse_document
+from boilerplate import BoilerplateLearner, source_host
+from expiry_index import ExpiryIndex
+from telemetry import NullTelemetry, Telemetry
+from scheduler import SourceScheduler
+from search_index import build_search_index
 
 # --- 1. Configuration ---
 URL_FILE = 'links.txt'
 SEEN_URLS_FILE = 'seen_urls.txt'
+SEEN_URLS_BLOOM_FILTER = True  # Keep a Bloom filter in front of the sorted seen-URL file.
+MIRROR_HOST_ALIASES = {'sarkariresult.com.im': 'sarkariresult.com.cm'}  # Mirror host -> canonical host for seen-URL keys.
+RESPONSE_CACHE_FILE = 'http_cache.json'
+RESPONSE_CACHE_MAX_ENTRIES = 500
 DATA_JSON_FILE = 'data.json'
+EXPIRY_INDEX_FILE = 'expiry_index.json'  # Min-heap of (archive_on, category, id) computed at insert time.
+STATIC_SHARDS_DIR = 'data'  # Per-category list indexes and per-post detail files built from data.json.
+SEARCH_INDEX_DIR = 'data/search'  # Sharded inverted index over titles, organisations, locations and categories.
 CONSOLIDATED_CONTENT_DIR = 'consolidated_content'
 GEMINI_RESPONSE_DIR = 'gemini_responses'
-CHECK_INTERVAL_SECONDS = 3600
+CHECK_INTERVAL_SECONDS = 3600  # Starting interval for a new source; the fixed interval when ADAPTIVE_SCHEDULING is off.
+ADAPTIVE_SCHEDULING = True  # Poll each source on its own interval from its observed new-link rate.
+SCHEDULER_STATE_FILE = 'scheduler_state.json'
+SCHEDULER_MIN_INTERVAL_SECONDS = 900
+SCHEDULER_MAX_INTERVAL_SECONDS = 6 * 3600
+SCHEDULER_MAX_BACKOFF_SECONDS = 24 * 3600  # Ceiling for the exponential backoff of a failing source.
+SCHEDULER_TARGET_LINKS_PER_POLL = 1.0     # Aim for about this many new links per poll.
+SCHEDULER_DUE_SLACK_SECONDS = 600        # Sources due within this long of a cycle are polled in it.
+ONCE_RUN_INTERVAL_SECONDS = 6 * 3600      # Cron cadence of --once runs (the GitHub workflow).
 GROUPING_SIMILARITY_THRESHOLD = 0.75
+FINGERPRINT_FILE = 'fingerprints.json'
+BOILERPLATE_FILE = 'boilerplate.json'
+BOILERPLATE_MIN_PAGES = 3    # A line must repeat on at least this many pages of one host...
+BOILERPLATE_MIN_RATIO = 0.6  # ...and on this share of all its pages to be stripped as template text.
+BOILERPLATE_WINDOW_PAGES = 200  # Page and line counts are scaled back to this many recent pages per host on save.
+GROUP_TOKEN_BUDGET = 12000   # Upper bound on article tokens per consolidated group (prompt excluded).
+MIN_ARTICLE_CHARS = 200      # Shorter article text (before or after boilerplate stripping) is rejected.
+REPOST_SIMILARITY_THRESHOLD = 0.9  # Estimated Jaccard over word 3-shingles vs. a source already published from another mirror.
+FETCH_MAX_WORKERS = 8           # Global cap on in-flight HTTP requests.
+FETCH_MAX_PER_HOST = 2          # Cap on in-flight requests to any single mirror.
+FETCH_HOST_DELAY_SECONDS = 0.5  # Politeness gap between request starts on the same host.
+FETCH_TIMEOUT_SECONDS = 15
+PARSER_BACKEND = 'html.parser'  # 'auto' picks selectolax/lxml when installed; they can split malformed nested links differently.
+MAIN_CONTENT_CLASS_RE = re.compile(r'content|post|entry|article')
 
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -30,6 +68,20 @@ GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
 # --- THIS IS THE ONLY CHANGE ---
 # The model name is not a secret, so we can set it directly in the code.
 GEMINI_MODEL = "gemini-2.5-flash-lite"
+LLM_BACKEND = os.getenv("SCRAPER_LLM_BACKEND", "gemini")  # "fake" runs extraction offline with FakeBackend.
+GEMINI_MAX_CONCURRENCY = 4
+GEMINI_REQUESTS_PER_MINUTE = 15
+GEMINI_MAX_RETRIES = 4
+LLM_DEFERRALS_FILE = 'llm_deferrals.json'
+LLM_MAX_DEFERRALS = 3  # Cycles a group may be deferred for after transient model errors before its links are marked seen.
+LLM_CACHE_DIR = 'llm_cache'
+LLM_CACHE_MAX_ENTRIES = 300
+LLM_CACHE_MAX_AGE_DAYS = 30
+TELEMETRY_ENABLED = os.getenv("SCRAPER_TELEMETRY", "0") == "1"  # Structured JSONL run telemetry; off means a no-op recorder.
+TELEMETRY_FILE = 'telemetry/run_telemetry.jsonl'
+TELEMETRY_MAX_BYTES = 2_000_000  # Rotate the log past this size...
+TELEMETRY_BACKUPS = 3            # ...keeping this many older files.
+telemetry = Telemetry(TELEMETRY_FILE, TELEMETRY_MAX_BYTES, TELEMETRY_BACKUPS) if TELEMETRY_ENABLED else NullTelemetry()
 
 # --- 2. AI Prompt (V33.0 - The Complete, Final Version) ---
 CUSTOM_PROMPT = """
@@ -154,6 +206,10 @@ def get_nested_value(data_dict, key_string):
 def get_latest_date_from_string(date_str):
     if not date_str or not isinstance(date_str, str):
         return None
+    return _parse_latest_date(date_str)
+@lru_cache(maxsize=4096)
+def _parse_latest_date(date_str):
+    # Free-text fields like "Objection Window" repeat across posts; the fuzzy dateutil fallback is the slow path.
     try:
         matches = re.findall(r'\d{1,2}[ -/]\w+[ -/]\d{4}|\d{4}[ -/]\d{2}[ -/]\d{2}', date_str)
         if not matches:
@@ -161,196 +217,248 @@ def get_latest_date_from_string(date_str):
         return date_parser(matches[-1]).date()
     except (ValueError, TypeError):
         return None
-def run_archiving_process(data_file_path):
+def compute_archive_date(category, item):
+    config = ARCHIVE_CONFIG.get(category)
+    if not config: return None
+    expiry_date = get_latest_date_from_string(get_nested_value(item, config['key']))
+    return expiry_date + timedelta(days=config['days_after']) if expiry_date else None
+def rebuild_expiry_index(store):
+    store.expiry.clear()
+    for category in ARCHIVE_CONFIG:
+        for item in store.items(category):
+            if isinstance(item, dict): store.expiry.schedule(category, item.get('id'), compute_archive_date(category, item))
+    store.expiry.save(store.digest)
+    print(f"  -> Rebuilt expiry index: {len(store.expiry)} dated post(s), next due {store.expiry.next_due()}.")
+def run_archiving_process(data_file_path, store=None):
+    # With a store, moves are staged in memory and written by the caller's commit;
+    # standalone, the file is loaded and committed here.
     print("\n--- Running Universal Archiving Process ---")
-    if not os.path.exists(data_file_path):
-        print(f"  -> {data_file_path} not found. Skipping archiving for this cycle.")
+    owns_store = store is None
+    if owns_store:
+        if not os.path.exists(data_file_path):
+            print(f"  -> {data_file_path} not found. Skipping archiving for this cycle.")
+            return
+        store = load_content_store(data_file_path)
+    today = datetime.now().date()
+    due_by_category = {}
+    for category, post_id in store.expiry.pop_due(today):
+        # The heap is never pruned eagerly; skip entries whose post already moved or vanished.
+        if store.location(post_id) == category: due_by_category.setdefault(category, []).append(store.get(post_id))
+    total_archived_count = 0
+    for category, items_to_archive in due_by_category.items():
+        print(f"  -> Archiving {len(items_to_archive)} item(s) from '{category}'.")
+        store.archive(category, items_to_archive)
+        total_archived_count += len(items_to_archive)
+    telemetry.event('archive', archived=total_archived_count, by_category={category: len(items) for category, items in due_by_category.items()})
+    if total_archived_count == 0:
+        print(f"  -> No content to archive in this cycle (next due: {store.expiry.next_due()}).")
         return
-    try:
-        with open(data_file_path, 'r+', encoding='utf-8') as f:
-            data = json.load(f)
-            today = datetime.now().date()
-            if "archived_content" not in data:
-                data["archived_content"] = {}
-            total_archived_count = 0
-            for category, config in ARCHIVE_CONFIG.items():
-                if category not in data or not data[category]:
-                    continue
-                active_items, items_to_archive = [], []
-                print(f"  -> Checking category: '{category}'")
-                for item in data.get(category, []):
-                    should_archive = False
-                    date_str = get_nested_value(item, config['key'])
-                    expiry_date = get_latest_date_from_string(date_str)
-                    if expiry_date:
-                        archive_on_date = expiry_date + timedelta(days=config['days_after'])
-                        if archive_on_date < today:
-                            should_archive = True
-                    if should_archive:
-                        items_to_archive.append(item)
-                    else:
-                        active_items.append(item)
-                if items_to_archive:
-                    print(f"    - Archiving {len(items_to_archive)} item(s).")
-                    if category not in data["archived_content"]:
-                        data["archived_content"][category] = []
-                    data["archived_content"][category] = items_to_archive + data["archived_content"][category]
-                    data[category] = active_items
-                    total_archived_count += len(items_to_archive)
-            if total_archived_count == 0:
-                print("  -> No content to archive in this cycle.")
-                return
-            f.seek(0)
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.truncate()
-            print(f"  -> Archiving complete. Moved a total of {total_archived_count} items.")
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"  -> Could not run archiving: {e}")
+    print(f"  -> Archiving complete. Moved a total of {total_archived_count} items.")
+    if owns_store: store.commit()
 
 # --- 4. Core Scraper & File Functions ---
 def generate_slug(text):
     text = text.lower(); text = re.sub(r'\s+', '-', text); text = re.sub(r'[^a-z0-9-]', '', text)
     return text[:80]
-def get_json_from_gemini(content):
-    if not GEMINI_API_KEY: print("  -> ERROR: GOOGLE_API_KEY not set."); return None, None
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel(GEMINI_MODEL)
-    full_prompt = CUSTOM_PROMPT + content
-    try:
-        print(f"  -> Contacting Gemini (Model: {GEMINI_MODEL})...")
-        response = model.generate_content(full_prompt)
-        raw_response_text = response.text.strip()
-        json_match = re.search(r'\{.*\}', raw_response_text, re.DOTALL)
-        if json_match: return json.loads(json_match.group(0)), raw_response_text
-        else: print("  -> ERROR: No valid JSON object in AI response."); print("  -> Raw Response:", raw_response_text); return None, raw_response_text
-    except Exception as e:
-        print(f"  -> FATAL ERROR with Gemini API: {e}"); return None, f"Error: {e}"
+_extraction_executor = None
+def get_extraction_executor():
+    # One backend (and so one configured Gemini client) per process.
+    global _extraction_executor
+    if _extraction_executor is None:
+        if LLM_BACKEND == "fake": backend = FakeBackend()
+        elif not GEMINI_API_KEY: print("  -> ERROR: GOOGLE_API_KEY not set."); return None
+        else: backend = GeminiBackend(GEMINI_API_KEY, GEMINI_MODEL)
+        _extraction_executor = ExtractionExecutor(backend, CUSTOM_PROMPT, max_concurrency=GEMINI_MAX_CONCURRENCY,
+                                                  requests_per_minute=GEMINI_REQUESTS_PER_MINUTE, max_retries=GEMINI_MAX_RETRIES,
+                                                  cache=LLMResultCache(LLM_CACHE_DIR, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_AGE_DAYS))
+    return _extraction_executor
 def load_seen_urls():
-    if not os.path.exists(SEEN_URLS_FILE): return set()
-    with open(SEEN_URLS_FILE, 'r') as f: return set(line.strip() for line in f)
-def save_seen_url(url):
-    with open(SEEN_URLS_FILE, 'a') as f: f.write(url + '\n')
+    return SeenUrlStore(SEEN_URLS_FILE, host_aliases=MIRROR_HOST_ALIASES, use_bloom=SEEN_URLS_BLOOM_FILTER)
 def read_urls_from_file(filename):
     if not os.path.exists(filename): return []
     with open(filename, 'r') as f: return [line.strip() for line in f if line.strip()]
-def load_data_json():
-    try:
-        with open(DATA_JSON_FILE, 'r', encoding='utf-8') as f: return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        print(f"Warning: {DATA_JSON_FILE} not found/invalid. Creating new.")
-        return {"latest_jobs": [], "result": [], "admit_card": [], "answer_key": [], "syllabus": [], "admission": [], "upcoming_jobs": [], "important_documents": [], "archived_content": {}}
-def save_data_json(data):
-    with open(DATA_JSON_FILE, 'w', encoding='utf-8') as f: json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"  -> SUCCESS: data.json has been updated.")
+def load_content_store(data_file_path=DATA_JSON_FILE):
+    expiry = ExpiryIndex(EXPIRY_INDEX_FILE)
+    def on_commit(data):
+        expiry.save(store.digest)
+        with telemetry.span('shard_build'): build_static_shards(data, STATIC_SHARDS_DIR)
+        with telemetry.span('search_index'): build_search_index(data, SEARCH_INDEX_DIR)
+    def on_insert(category, entry):
+        expiry.schedule(category, entry['id'], compute_archive_date(category, entry))
+    store = ContentStore(data_file_path, on_commit=on_commit, on_insert=on_insert)
+    store.expiry = expiry
+    # A missing index, or one saved against a different data.json (a crash between the two writes,
+    # or an edit outside the store), would leave posts that are never archived.
+    if not expiry.matches(store.digest):
+        print(f"  -> {EXPIRY_INDEX_FILE} is missing or out of date with {data_file_path}.")
+        rebuild_expiry_index(store)
+    return store
 def save_gemini_response(slug, response_text):
     if not os.path.exists(GEMINI_RESPONSE_DIR): os.makedirs(GEMINI_RESPONSE_DIR)
     timestamp = int(time.time() * 1000)
     filepath = os.path.join(GEMINI_RESPONSE_DIR, f"{slug}-{timestamp}.json")
     with open(filepath, 'w', encoding='utf-8') as f: f.write(response_text)
     print(f"  -> Saved Gemini response to: {filepath}")
-def scrape_website_for_new_links(base_url, seen_urls):
+def create_fetch_engine():
+    return FetchEngine(max_workers=FETCH_MAX_WORKERS, max_per_host=FETCH_MAX_PER_HOST, host_delay=FETCH_HOST_DELAY_SECONDS, timeout=FETCH_TIMEOUT_SECONDS)
+def parse_listing_page(base_url, html_content, seen_urls):
     new_articles, current_year = [], datetime.now().year
     RELEVANT_KEYWORDS = ['police', 'constable', 'ssc', 'ibps', 'railway', 'recruitment', 'admit card', 'result', 'notification', 'vacancy', 'bharti', 'answer key', 'syllabus', 'admission', 'apply online', 'download', 'cgl', 'chsl', 'mts', 'teacher', 'officer']
     GENERIC_LINK_TEXTS = {'admit card', 'result', 'latest jobs', 'answer key', 'syllabus', 'admission', 'sarkariresult tools', 'sarkariresult', 'rojgar result', 'sarkari result', 'privacy policy'}
-    try:
-        response = requests.get(base_url, timeout=15, headers={'User-Agent': 'Mozilla/5.0'})
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        for link in soup.find_all('a', href=True):
-            original_link_text = link.get_text(strip=True)
-            link_text_lower = original_link_text.lower()
-            if len(link_text_lower.split()) < 2 or any(generic in link_text_lower for generic in GENERIC_LINK_TEXTS): continue
-            if any(keyword in link_text_lower for keyword in RELEVANT_KEYWORDS):
-                years_in_title = re.findall(r'\b(202\d)\b', original_link_text)
-                if years_in_title and any(int(year) < current_year for year in years_in_title):
-                    if not any(int(year) >= current_year for year in years_in_title):
-                       print(f"  -> SKIPPING (Outdated Year): '{original_link_text}'"); continue
-                link_href = urljoin(base_url, link['href'])
-                if link_href not in seen_urls:
-                    print(f"  -> Found new post link: '{original_link_text}'")
-                    new_articles.append({'title': original_link_text, 'url': link_href})
-                    seen_urls.add(link_href)
-    except requests.RequestException as e: print(f"Error scraping {base_url}: {e}")
+    for original_link_text, href in iter_anchors(html_content, PARSER_BACKEND):
+        link_text_lower = original_link_text.lower()
+        if len(link_text_lower.split()) < 2 or any(generic in link_text_lower for generic in GENERIC_LINK_TEXTS): continue
+        if any(keyword in link_text_lower for keyword in RELEVANT_KEYWORDS):
+            years_in_title = re.findall(r'\b(202\d)\b', original_link_text)
+            if years_in_title and any(int(year) < current_year for year in years_in_title):
+                if not any(int(year) >= current_year for year in years_in_title):
+                   print(f"  -> SKIPPING (Outdated Year): '{original_link_text}'"); continue
+            link_href = urljoin(base_url, href)
+            if link_href not in seen_urls:
+                print(f"  -> Found new post link: '{original_link_text}'")
+                new_articles.append({'title': original_link_text, 'url': link_href})
+                seen_urls.add(link_href)
     return new_articles
-def scrape_article_and_links(article_url):
-    try:
-        print(f"  -> Scraping content & links from: {article_url}")
-        response = requests.get(article_url, timeout=15, headers={'User-Agent': 'Mozilla/5.0'})
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        important_links = {}
-        link_keywords = ['apply online', 'notification', 'official website', 'login', 'click here', 'download result', 'admit card', 'answer key', 'syllabus']
-        for link in soup.find_all('a', href=True):
-            link_text_clean = re.sub(r'\s+', ' ', link.get_text(strip=True)).strip()
-            if any(keyword in link_text_clean.lower() for keyword in link_keywords):
-                if link_text_clean not in important_links:
-                     important_links[link_text_clean] = urljoin(article_url, link['href'])
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'form', 'aside']): element.decompose()
-        main_content = soup.find('article') or soup.find('main') or soup.find(id='post') or soup.find(class_=re.compile(r'content|post|entry|article')) or soup.body
-        if main_content: text = main_content.get_text(separator='\n', strip=True)
-        else: print(f"  -> WARN: Could not find main content for {article_url}."); text = ""
-        if important_links:
-            text += "\n\n--- EXTRACTED LINKS ---\n"
-            for link_text, url in important_links.items(): text += f'"{link_text}": "{url}"\n'
-        return text
-    except requests.RequestException as e: print(f"  -> ERROR fetching {article_url}: {e}"); return ""
-
-# --- 5. Main Execution ---
-def run_automation_cycle():
-    print(f"--- AapkaRojgar Scraper V33.1 (Final Correction) ---")
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting new scan...")
-    run_archiving_process(DATA_JSON_FILE)
-    website_urls = read_urls_from_file(URL_FILE)
-    if not website_urls: print(f"FATAL: No URLs in {URL_FILE}. Exiting."); return
-    seen_urls = load_seen_urls()
-    print(f"Loaded {len(seen_urls)} previously seen URLs.")
-    all_new_articles_meta = []
-    for url in website_urls:
+def parse_article_page(article_url, html_content):
+    soup = parse_document(html_content, PARSER_BACKEND)
+    important_links = {}
+    link_keywords = ['apply online', 'notification', 'official website', 'login', 'click here', 'download result', 'admit card', 'answer key', 'syllabus']
+    for link in soup.find_all('a', href=True):
+        link_text_clean = re.sub(r'\s+', ' ', link.get_text(strip=True)).strip()
+        if any(keyword in link_text_clean.lower() for keyword in link_keywords):
+            if link_text_clean not in important_links:
+                 important_links[link_text_clean] = urljoin(article_url, link['href'])
+    for element in soup(['script', 'style', 'nav', 'footer', 'header', 'form', 'aside']): element.decompose()
+    main_content = soup.find('article') or soup.find('main') or soup.find(id='post') or soup.find(class_=MAIN_CONTENT_CLASS_RE) or soup.body
+    if main_content: text = main_content.get_text(separator='\n', strip=True)
+    else: print(f"  -> WARN: Could not find main content for {article_url}."); text = ""
+    if important_links:
+        text += "\n\n--- EXTRACTED LINKS ---\n"
+        for link_text, url in important_links.items(): text += f'"{link_text}": "{url}"\n'
+    return text
+def record_fetches(results, kind):
+    if not telemetry.enabled: return
+    for result in results:
+        telemetry.event('fetch', seconds=result.elapsed, kind=kind, host=source_host(result.url), status=result.status_code,
+                        bytes=len(result.content or b''), error=type(result.error).__name__ if result.error else None)
+def fetch_new_articles(engine, website_urls, seen_urls, response_cache=None, source_outcomes=None):
+    # Every listing page is requested at once. As each one is parsed (in links.txt order, so seen-URL
+    # dedup and the grouping corpus stay deterministic) its article pages are queued straight away,
+    # while later listings are still in flight, and articles are parsed as their fetches complete.
+    # source_outcomes, if given, maps each listing URL to its new-link count (None if the fetch failed).
+    if source_outcomes is None: source_outcomes = {}
+    new_links, article_futures = [], []
+    listing_futures = [engine.submit(url, response_cache.conditional_headers(url) if response_cache else None) for url in website_urls]
+    for url, future in zip(website_urls, listing_futures):
+        result = future.result()
+        record_fetches([result], 'listing')
         print(f"\nScraping {url} for new links...")
-        new_links = scrape_website_for_new_links(url, seen_urls)
-        for link_info in new_links:
-            content_with_links = scrape_article_and_links(link_info['url'])
-            if content_with_links and len(content_with_links) > 200:
-                all_new_articles_meta.append({'title': link_info['title'], 'content': content_with_links, 'url': link_info['url']})
-            else: save_seen_url(link_info['url'])
-    if not all_new_articles_meta: print("\nScan complete. No new valid articles."); return
-    print(f"\n--- PHASE 2: Grouping {len(all_new_articles_meta)} articles by similarity ---")
-    corpus = [meta['content'] for meta in all_new_articles_meta]
-    vectorizer = TfidfVectorizer(stop_words='english').fit_transform(corpus)
-    similarity_matrix = cosine_similarity(vectorizer)
-    groups, visited_indices = [], set()
-    for i in range(len(all_new_articles_meta)):
-        if i in visited_indices: continue
-        similar_indices = {i}
-        queue = [i]; visited_in_group = {i}
-        while queue:
-            current_index = queue.pop(0)
-            for j in range(len(all_new_articles_meta)):
-                if j not in visited_in_group and similarity_matrix[current_index, j] > GROUPING_SIMILARITY_THRESHOLD:
-                    similar_indices.add(j); visited_in_group.add(j); queue.append(j)
-        current_group = [all_new_articles_meta[idx] for idx in sorted(list(similar_indices))]
-        groups.append(current_group)
-        for idx in similar_indices: visited_indices.add(idx)
+        if not result.ok: print(f"Error scraping {url}: {result.error}"); source_outcomes[url] = None; continue
+        source_outcomes[url] = 0
+        if response_cache:
+            cache_status = response_cache.check(url, result)
+            if cache_status != ResponseCache.CHANGED: print(f"  -> Page {cache_status.replace('_', ' ')} since last run. Skipping."); continue
+        with telemetry.span('parse_listing', host=source_host(url)): found_links = parse_listing_page(url, result.content, seen_urls)
+        source_outcomes[url] = len(found_links)
+        for link_info in found_links:
+            link_info['source'] = url
+            new_links.append(link_info)
+            article_futures.append(engine.submit(link_info['url']))
+    telemetry.count('new_links', len(new_links))
+    articles, rejected_urls = [], []
+    for link_info, future in zip(new_links, article_futures):
+        result = future.result()
+        record_fetches([result], 'article')
+        print(f"  -> Scraping content & links from: {link_info['url']}")
+        if result.ok:
+            with telemetry.span('parse_article', host=source_host(link_info['url'])): content_with_links = parse_article_page(link_info['url'], result.content)
+        else: print(f"  -> ERROR fetching {link_info['url']}: {result.error}"); content_with_links = ""
+        if content_with_links and len(content_with_links) > MIN_ARTICLE_CHARS:
+            articles.append({'title': link_info['title'], 'content': content_with_links, 'url': link_info['url'], 'source': link_info['source']})
+        else: rejected_urls.append(link_info['url'])
+    telemetry.count('articles_rejected', len(rejected_urls))
+    return articles, rejected_urls
+
+def process_new_articles(all_new_articles_meta, store, fingerprints, boilerplate, processed_urls, deferrals=None):
+    # Every URL that is finished with (published, duplicate or rejected) is appended to
+    # processed_urls; the caller persists them only after the store has been committed.
+    # Returns the listing pages whose links were deferred to a later cycle.
+    deferred_sources = set()
+    if deferrals is None: deferrals = DeferralLedger(LLM_DEFERRALS_FILE, LLM_MAX_DEFERRALS)
+    if not all_new_articles_meta: print("\nScan complete. No new valid articles."); return deferred_sources
+    # Learn from the raw pages first so template lines repeated within this batch also count.
+    with telemetry.span('boilerplate', articles=len(all_new_articles_meta)):
+        for article_meta in all_new_articles_meta: boilerplate.observe(article_meta['url'], article_meta['content'])
+        for article_meta in all_new_articles_meta: article_meta['content'] = boilerplate.strip(article_meta['url'], article_meta['content'])
+    # Pages that were mostly template text are rejected (and marked seen) like any other too-short page.
+    stripped_articles_meta = []
+    for article_meta in all_new_articles_meta:
+        if len(article_meta['content']) > MIN_ARTICLE_CHARS: stripped_articles_meta.append(article_meta); continue
+        print(f"  -> REJECTED (only boilerplate left): {article_meta['url']}")
+        processed_urls.append(article_meta['url'])
+    telemetry.count('articles_rejected', len(all_new_articles_meta) - len(stripped_articles_meta))
+    all_new_articles_meta = stripped_articles_meta
+    if not all_new_articles_meta: print("\nScan complete. No new valid articles after boilerplate stripping."); return deferred_sources
+    fresh_articles_meta = []
+    with telemetry.span('fingerprint', articles=len(all_new_articles_meta)):
+        for article_meta in all_new_articles_meta:
+            article_meta['fingerprint'] = fingerprints.signature(article_meta['content'])
+            repost_of, score = fingerprints.match(article_meta['fingerprint'], source_host(article_meta['url']))
+            if repost_of: print(f"  -> REPOST of '{repost_of}' (similarity {score:.2f}): {article_meta['url']}"); processed_urls.append(article_meta['url'])
+            else: fresh_articles_meta.append(article_meta)
+    telemetry.count('reposts', len(all_new_articles_meta) - len(fresh_articles_meta))
+    if not fresh_articles_meta: print("\nScan complete. All new articles were reposts."); return deferred_sources
+    print(f"\n--- PHASE 2: Grouping {len(fresh_articles_meta)} articles by similarity ---")
+    with telemetry.span('grouping', articles=len(fresh_articles_meta)): groups = group_articles(fresh_articles_meta, GROUPING_SIMILARITY_THRESHOLD)
     print(f"\n--- PHASE 3 & 4: Consolidating {len(groups)} groups for AI Analysis ---")
     if not os.path.exists(CONSOLIDATED_CONTENT_DIR): os.makedirs(CONSOLIDATED_CONTENT_DIR)
     today_date_str = datetime.now().strftime("%Y-%m-%d")
+    consolidated_groups = []
     for i, group in enumerate(groups):
-        print(f"\n--- Processing Group {i+1}/{len(groups)} ---")
-        consolidated_content, group_urls = "", []
-        consolidated_content += f"IMPORTANT CONTEXT: Today's date is {today_date_str}. Use this for the 'creation_date' field and to determine if a job is current or upcoming.\n\n"
-        for article_meta in group:
-            print(f"  - Combining: {article_meta['title']}")
-            consolidated_content += f"\n--- Source: {article_meta['url']} ---\n\n{article_meta['content']}"
-            group_urls.append(article_meta['url'])
-        group_slug = generate_slug(group[0]['title'])
-        consolidated_filepath = os.path.join(CONSOLIDATED_CONTENT_DIR, f"{group_slug}.txt")
-        with open(consolidated_filepath, 'w', encoding='utf-8') as f: f.write(consolidated_content)
+        print(f"\n--- Consolidating Group {i+1}/{len(groups)} ---")
+        with telemetry.span('consolidation', articles=len(group)):
+            consolidated_content, group_urls = "", []
+            consolidated_content += f"IMPORTANT CONTEXT: Today's date is {today_date_str}. Use this for the 'creation_date' field and to determine if a job is current or upcoming.\n\n"
+            for article_meta, article_content in zip(group, boilerplate.fit_group(group, GROUP_TOKEN_BUDGET)):
+                print(f"  - Combining: {article_meta['title']}")
+                consolidated_content += f"\n--- Source: {article_meta['url']} ---\n\n{article_content}"
+                group_urls.append(article_meta['url'])
+            group_slug = generate_slug(group[0]['title'])
+            consolidated_filepath = os.path.join(CONSOLIDATED_CONTENT_DIR, f"{group_slug}.txt")
+            with open(consolidated_filepath, 'w', encoding='utf-8') as f: f.write(consolidated_content)
         print(f"  -> Saved consolidated content to: {consolidated_filepath}")
-        new_json_entry, raw_response = get_json_from_gemini(consolidated_content)
+        consolidated_groups.append((group, group_urls, group_slug, consolidated_content))
+    boilerplate.report()
+    executor = get_extraction_executor()
+    if not executor:
+        deferred_sources.update(meta['source'] for meta in fresh_articles_meta)
+        telemetry.count('deferred_groups', len(groups))
+        print("\n  -> No extraction backend available. Leaving all groups for the next cycle."); return deferred_sources
+    print(f"\n--- Extracting {len(groups)} groups ({executor.max_concurrency} concurrent, {GEMINI_REQUESTS_PER_MINUTE} requests/min) ---")
+    with telemetry.span('extraction', groups=len(groups)):
+        results = executor.extract_all(consolidated_content for *_, consolidated_content in consolidated_groups)
+    if executor.cache: executor.cache.save(); executor.cache.report()
+    for i, ((group, group_urls, group_slug, consolidated_content), result) in enumerate(zip(consolidated_groups, results)):
+        print(f"\n--- Processing Group {i+1}/{len(groups)} ---")
+        new_json_entry, raw_response = result.entry, result.raw_response
+        telemetry.event('llm', seconds=result.elapsed, cached=result.cached, attempts=result.attempts, transient=result.transient,
+                        prompt_chars=len(executor.prompt) + len(consolidated_content), response_chars=len(raw_response or ''))
         if raw_response: save_gemini_response(group_slug, raw_response)
+        if result.transient and deferrals.defer(group_urls):
+            # Not marked seen: the links are picked up again next cycle instead of being lost.
+            print(f"  -> RESULT: Model still unavailable after {result.attempts} attempt(s). Deferring group to the next cycle.")
+            deferred_sources.update(meta['source'] for meta in group)
+            telemetry.count('deferred_groups')
+            continue
+        if result.transient:
+            print(f"  -> RESULT: Model still unavailable after {deferrals.max_deferrals} deferral(s). Giving up on this group.")
+            telemetry.count('abandoned_groups')
+            processed_urls.extend(group_urls)
+            continue
         if not new_json_entry or not isinstance(new_json_entry, dict):
             print("  -> RESULT: AI failed to produce a valid JSON object. Discarding group.")
-            for url in group_urls: save_seen_url(url)
+            telemetry.count('discarded_groups')
+            processed_urls.extend(group_urls)
             continue
         new_json_entry['creation_date'] = today_date_str
         entry_type = new_json_entry.get("type")
@@ -362,31 +470,107 @@ def run_automation_cycle():
         category_key = category_key_map.get(entry_type)
         if not category_key: 
             print(f"  -> SKIPPING GROUP: AI returned unknown type '{entry_type}'.")
-            for url in group_urls: save_seen_url(url)
+            telemetry.count('discarded_groups')
+            processed_urls.extend(group_urls)
             continue
         if not new_json_entry.get("id"): 
             print(f"  -> SKIPPING GROUP: AI failed to generate 'id'.")
-            for url in group_urls: save_seen_url(url)
+            telemetry.count('discarded_groups')
+            processed_urls.extend(group_urls)
             continue
-        master_data = load_data_json()
-        if any(entry.get('id') == new_json_entry.get('id') for entry in master_data.get(category_key, [])):
-            print(f"  -> RESULT: Duplicate ID '{new_json_entry.get('id')}' found. Discarding.")
+        if new_json_entry['id'] in store:
+            print(f"  -> RESULT: Duplicate ID '{new_json_entry['id']}' found in '{store.location(new_json_entry['id'])}'. Discarding.")
+            telemetry.count('duplicates')
         else:
             print(f"  -> RESULT: Unique post. Adding to '{category_key}'.")
-            if category_key not in master_data: master_data[category_key] = []
-            master_data[category_key].insert(0, new_json_entry)
-            save_data_json(master_data)
-        for url in group_urls: save_seen_url(url)
+            store.insert(category_key, new_json_entry)
+            telemetry.count('inserted')
+        for article_meta in group: fingerprints.add(new_json_entry['id'], article_meta['fingerprint'], source_host(article_meta['url']))
+        processed_urls.extend(group_urls)
+    deferrals.forget(processed_urls)
     print("\n--- All new articles processed. ---")
+    return deferred_sources
+
+# --- 5. Main Execution ---
+def load_scheduler(once=False):
+    # A --once run can't wake up when a source falls due, so it polls every source due nearer to this run than the next.
+    due_slack = ONCE_RUN_INTERVAL_SECONDS // 2 if once else SCHEDULER_DUE_SLACK_SECONDS
+    return SourceScheduler(SCHEDULER_STATE_FILE, default_interval=CHECK_INTERVAL_SECONDS, min_interval=SCHEDULER_MIN_INTERVAL_SECONDS,
+                           max_interval=SCHEDULER_MAX_INTERVAL_SECONDS, max_backoff=SCHEDULER_MAX_BACKOFF_SECONDS,
+                           target_links_per_poll=SCHEDULER_TARGET_LINKS_PER_POLL, due_slack=due_slack)
+def update_scheduler(scheduler, website_urls, source_outcomes, deferred_sources, polled_at):
+    # polled_at is when the cycle started: stamping the end would push every due time back by the cycle's own LLM work.
+    for url in website_urls:
+        new_links = source_outcomes.get(url)
+        if new_links is None: scheduler.record_failure(url, polled_at)
+        else: scheduler.record_success(url, new_links, polled_at)
+        # Deferred links are only re-read with their listing page, so don't leave them waiting a full interval.
+        if url in deferred_sources: scheduler.poll_soon(url, polled_at)
+        state = scheduler.sources[url]
+        telemetry.event('poll', host=source_host(url), new_links=new_links, interval=state['interval'], failures=state['failures'])
+    scheduler.save()
+    print("\n--- Source schedule ---")
+    scheduler.report()
+
+def run_automation_cycle(scheduler=None):
+    # With a scheduler only the sources that are due are polled; without one, every source in links.txt.
+    print(f"--- AapkaRojgar Scraper V33.1 (Final Correction) ---")
+    cycle_started = time.time()
+    print(f"[{datetime.fromtimestamp(cycle_started).strftime('%Y-%m-%d %H:%M:%S')}] Starting new scan...")
+    telemetry.start_cycle()
+    with telemetry.span('json_load', path=DATA_JSON_FILE): store = load_content_store()
+    run_archiving_process(DATA_JSON_FILE, store)
+    website_urls = read_urls_from_file(URL_FILE)
+    if not website_urls: store.commit(); telemetry.end_cycle(sources=0); print(f"FATAL: No URLs in {URL_FILE}. Exiting."); return
+    if scheduler:
+        scheduler.sync(website_urls, cycle_started)
+        website_urls = scheduler.due(cycle_started)
+        if not website_urls: store.commit(); telemetry.end_cycle(sources=0); print("No sources are due yet."); return
+        print(f"Polling {len(website_urls)} due source(s).")
+    with telemetry.span('seen_load'): seen_urls = load_seen_urls()
+    print(f"Loaded {len(seen_urls)} previously seen URLs.")
+    response_cache = ResponseCache(RESPONSE_CACHE_FILE, max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+    fingerprints = FingerprintIndex(FINGERPRINT_FILE, threshold=REPOST_SIMILARITY_THRESHOLD)
+    boilerplate = BoilerplateLearner(BOILERPLATE_FILE, min_pages=BOILERPLATE_MIN_PAGES, min_ratio=BOILERPLATE_MIN_RATIO,
+                                     window_pages=BOILERPLATE_WINDOW_PAGES)
+    deferrals = DeferralLedger(LLM_DEFERRALS_FILE, LLM_MAX_DEFERRALS)
+    with create_fetch_engine() as engine:
+        source_outcomes = {}
+        all_new_articles_meta, processed_urls = fetch_new_articles(engine, website_urls, seen_urls, response_cache, source_outcomes)
+    response_cache.report()
+    deferred_sources = process_new_articles(all_new_articles_meta, store, fingerprints, boilerplate, processed_urls, deferrals)
+    # Listing pages with deferred links must be parsed again next time, even if unchanged.
+    for source_url in deferred_sources: response_cache.forget(source_url)
+    # data.json is written once, then the seen URLs, fingerprints and cache validators that
+    # depend on it. A crash before the commit re-processes this cycle's links next time.
+    with telemetry.span('json_save', path=DATA_JSON_FILE): store.commit()
+    with telemetry.span('seen_flush'):
+        for url in processed_urls: seen_urls.record(url)
+        print(f"  -> Recorded {seen_urls.flush()} new seen URL(s).")
+    seen_urls.close()
+    fingerprints.save()
+    deferrals.save()
+    if all_new_articles_meta: boilerplate.save()
+    response_cache.save()
+    if scheduler: update_scheduler(scheduler, website_urls, source_outcomes, deferred_sources, cycle_started)
+    telemetry.end_cycle(sources=len(website_urls), new_articles=len(all_new_articles_meta), deferred_sources=len(deferred_sources))
 
 if __name__ == "__main__":
-    if not GEMINI_API_KEY:
+    parser = argparse.ArgumentParser(description="AapkaRojgar content scraper.")
+    parser.add_argument('--reindex-expiry', action='store_true', help=f"Recompute {EXPIRY_INDEX_FILE} from {DATA_JSON_FILE} and exit.")
+    parser.add_argument('--once', action='store_true', help="Run a single cycle and exit (for cron jobs such as the GitHub workflow).")
+    args = parser.parse_args()
+    if args.reindex_expiry:
+        rebuild_expiry_index(load_content_store())
+    elif LLM_BACKEND == "gemini" and not GEMINI_API_KEY:
         print("CRITICAL ERROR: The GOOGLE_API_KEY is not set in your .env file.")
     else:
         for directory in [GEMINI_RESPONSE_DIR, CONSOLIDATED_CONTENT_DIR]:
             if not os.path.exists(directory): os.makedirs(directory)
+        scheduler = load_scheduler(args.once) if ADAPTIVE_SCHEDULING else None
         while True:
-            run_automation_cycle()
-            run_archiving_process(DATA_JSON_FILE)
-            print(f"\nCycle complete. Next scan will start in {CHECK_INTERVAL_SECONDS // 60} minutes.")
-            time.sleep(CHECK_INTERVAL_SECONDS)
+            run_automation_cycle(scheduler)
+            if args.once: break
+            wait_seconds = max(60, int(scheduler.seconds_until_due())) if scheduler else CHECK_INTERVAL_SECONDS
+            print(f"\nCycle complete. Next scan will start in {wait_seconds // 60} minutes.")
+            time.sleep(wait_seconds)
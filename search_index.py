@@ -0,0 +1,258 @@
+# AapkaRojgar Tools - Precomputed Search Index
+#
+# An inverted index over each post's title, post_name, post_subtitle,
+# organization, location and category, written next to the static shards so
+# search never has to download data.json:
+#   data/search/meta.json             format, field bits and bucket settings
+#   data/search/terms/<xx>.json       {term: {field_mask: [doc, ...]}} for terms starting with xx
+#   data/search/phonetic/<xx>.json    the same, keyed by transliteration-folded skeletons
+#   data/search/docs/<nn>.json        {doc: [post_id, title, category, last_date, archived]}, nn = doc % doc_buckets
+# Posts are referred to by small integer doc numbers, which are read back
+# from the previous build so they stay stable and unchanged buckets keep
+# identical bytes. Terms are bucketed by their first prefix_length
+# characters, so one small file answers both an exact lookup and a prefix
+# (type-ahead) scan. Hindi
+# words are spelled many ways in Latin script (bharti / bharati / bharthi);
+# phonetic_key() folds aspirates and drops vowels so all spellings share a
+# key. Shards go through site_build.write_shards(), so a commit only rewrites
+# the buckets whose postings actually changed.
+#
+# search() works the same on an index built in memory (SearchIndex) and on
+# the files on disk (ShardedSearchIndex, which loads buckets lazily).
+
+import argparse
+import json
+import os
+import re
+from functools import lru_cache
+
+from content_store import ARCHIVE_KEY
+from site_build import write_shards
+
+FORMAT_VERSION = 1
+FIELD_BITS = {'title': 1, 'post_name': 2, 'post_subtitle': 4, 'organization': 8, 'location': 16, 'category': 32}
+FIELD_WEIGHTS = {'title': 3.0, 'post_name': 2.0, 'post_subtitle': 1.5, 'organization': 2.0, 'location': 1.0, 'category': 1.0}
+EXACT_WEIGHT, PHONETIC_WEIGHT, PREFIX_WEIGHT = 1.0, 0.6, 0.5
+ARCHIVED_PENALTY = 0.5
+MAX_PREFIX_TERMS = 50
+BROTLI_QUALITY = 6  # Term buckets are rewritten on most commits; max-quality brotli costs seconds per megabyte.
+MASK_SCORES = [sum(FIELD_WEIGHTS[field] for field, bit in FIELD_BITS.items() if mask & bit) for mask in range(1 << len(FIELD_BITS))]
+STOP_WORDS = frozenset('a an and are as at be by for from in is of on or the to with'.split())
+ORGANIZATION_KEYS = ('organization', 'organisation', 'department', 'board', 'conducting body', 'recruitment board')
+LOCATION_KEYS = ('location', 'job location', 'state')
+TOKEN_RE = re.compile(r'[^\W_]+')
+# Order matters: aspirated digraphs collapse before the stray 'h' is dropped.
+PHONETIC_RULES = (('ee', 'i'), ('oo', 'u'), ('ph', 'f'), ('kh', 'k'), ('gh', 'g'), ('ch', 'c'), ('jh', 'j'), ('th', 't'), ('dh', 'd'), ('bh', 'b'),
+                  ('sh', 's'), ('ck', 'k'), ('q', 'k'), ('x', 'ks'), ('w', 'v'), ('z', 'j'))
+VOWELS_RE = re.compile(r'[aeiouyh]')
+REPEATS_RE = re.compile(r'(.)\1+')
+
+
+@lru_cache(maxsize=65536)
+def tokenize(text):
+    return tuple(token for token in TOKEN_RE.findall(text.casefold()) if token not in STOP_WORDS)
+
+
+@lru_cache(maxsize=65536)
+def phonetic_key(token):
+    """Consonant skeleton of a romanised word plus its final vowel ('bharati' -> 'brti', 'bharat' -> 'brt').
+
+    None for short or non-Latin tokens.
+    """
+    if len(token) < 4 or not token.isascii() or not token.isalpha(): return None
+    for pattern, replacement in PHONETIC_RULES: token = token.replace(pattern, replacement)
+    skeleton = REPEATS_RE.sub(r'\1', token[0] + VOWELS_RE.sub('', token[1:]))
+    # The final vowel often carries meaning in Hindi (bharti "recruitment" vs bharat "India"); interior ones vary freely.
+    ending = {'y': 'i'}.get(token[-1], token[-1]) if token[-1] in 'aeiouy' else ''
+    return skeleton + ending if len(skeleton) >= 2 else None
+
+
+def bucket_name(term, prefix_length):
+    prefix = term[:prefix_length]
+    # Non-ASCII prefixes (e.g. Devanagari) get a hex name so every bucket is a plain file name.
+    return prefix if prefix.isascii() and prefix.isalnum() else 'x' + prefix.encode('utf-8').hex()
+
+
+def _summaries(item):
+    details = item.get('details')
+    if not isinstance(details, dict): return []
+    return [details] + [value for key, value in details.items() if key.endswith('_summary') and isinstance(value, dict)]
+
+
+def _keyed_values(item, keys):
+    for source in [item] + _summaries(item):
+        for key, value in source.items():
+            if isinstance(value, str) and key.lower() in keys: yield value
+
+
+def field_values(category, item):
+    """{field: [text, ...]} for every indexed field of one post."""
+    details = item.get('details') if isinstance(item.get('details'), dict) else {}
+    breakdown = (details.get('vacancy_details') or {}).get('breakdown') if isinstance(details.get('vacancy_details'), dict) else None
+    states = [row['State'] for row in breakdown or [] if isinstance(row, dict) and isinstance(row.get('State'), str)]
+    values = {'title': [item.get('title')], 'post_name': [details.get('post_name')], 'post_subtitle': [details.get('post_subtitle')],
+              'organization': list(_keyed_values(item, ORGANIZATION_KEYS)), 'location': list(_keyed_values(item, LOCATION_KEYS)) + states,
+              'category': [category.replace('_', ' ')]}
+    return {field: [value for value in texts if isinstance(value, str) and value] for field, texts in values.items()}
+
+
+class _Searchable:
+    """search() over three lookups a subclass provides: _terms(bucket), _phonetic(bucket) and _doc(number)."""
+    prefix_length = 2
+
+    def _matches(self, token, is_last):
+        """{doc: score} for one query token across exact, phonetic and (last token only) prefix matches."""
+        scores = {}
+
+        def credit(postings, weight):
+            for mask, docs in postings.items():
+                score = weight * MASK_SCORES[int(mask)]
+                for doc in docs:
+                    if score > scores.get(doc, 0.0): scores[doc] = score
+
+        bucket = self._terms(bucket_name(token, self.prefix_length))
+        credit(bucket.get(token, {}), EXACT_WEIGHT)
+        key = phonetic_key(token)
+        if key: credit(self._phonetic(bucket_name(key, self.prefix_length)).get(key, {}), PHONETIC_WEIGHT)
+        if is_last and len(token) >= self.prefix_length:
+            expansions = sorted(term for term in bucket if term.startswith(token) and term != token)[:MAX_PREFIX_TERMS]
+            for term in expansions: credit(bucket[term], PREFIX_WEIGHT)
+        return scores
+
+    def search(self, query, limit=20, include_archived=True):
+        """Posts matching every query word, best first, as dicts with id/title/category/last_date/archived/score."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens: return []
+        totals = None
+        for i, token in enumerate(tokens):
+            scores = self._matches(token, i == len(tokens) - 1)
+            totals = scores if totals is None else {doc: totals[doc] + score for doc, score in scores.items() if doc in totals}
+            if not totals: return []
+        results = []
+        for number, score in totals.items():
+            doc = self._doc(number)
+            if not doc or (doc[4] and not include_archived): continue
+            results.append({'id': doc[0], 'title': doc[1], 'category': doc[2], 'last_date': doc[3], 'archived': bool(doc[4]),
+                            'score': round(score * (ARCHIVED_PENALTY if doc[4] else 1.0), 3)})
+        results.sort(key=lambda result: (-result['score'], result['archived']))
+        return results[:limit]
+
+
+class SearchIndex(_Searchable):
+    def __init__(self, prefix_length=2, doc_buckets=64, numbers=None):
+        self.prefix_length, self.doc_buckets = prefix_length, doc_buckets
+        self.numbers = dict(numbers or {})  # post_id -> doc number, carried over from the previous build.
+        self._next_number = max(self.numbers.values(), default=-1) + 1
+        self.terms, self.phonetic, self.docs, self._indexed = {}, {}, {}, set()
+
+    @classmethod
+    def from_data(cls, data, **kwargs):
+        index = cls(**kwargs)
+        # Live posts first, so an id that is both live and archived is indexed as live (as in ContentStore).
+        for category, items in data.items():
+            if category != ARCHIVE_KEY and isinstance(items, list):
+                for item in items: index.add(category, item)
+        for category, items in data.get(ARCHIVE_KEY, {}).items():
+            if isinstance(items, list):
+                for item in items: index.add(category, item, archived=True)
+        return index
+
+    def add(self, category, item, archived=False):
+        post_id = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(post_id, str) or not post_id or post_id in self._indexed: return False
+        self._indexed.add(post_id)
+        number = self.numbers.get(post_id)
+        if number is None:
+            number = self.numbers[post_id] = self._next_number
+            self._next_number += 1
+        self.docs[number] = [post_id, item.get('title'), category, item.get('last_date'), 1 if archived else 0]
+        masks, phonetic_masks = {}, {}
+        for field, texts in field_values(category, item).items():
+            for text in texts:
+                for token in tokenize(text): masks[token] = masks.get(token, 0) | FIELD_BITS[field]
+        for token, mask in masks.items():
+            key = phonetic_key(token)
+            if key: phonetic_masks[key] = phonetic_masks.get(key, 0) | mask
+        for buckets, term_masks in ((self.terms, masks), (self.phonetic, phonetic_masks)):
+            for term, mask in term_masks.items():
+                buckets.setdefault(bucket_name(term, self.prefix_length), {}).setdefault(term, {}).setdefault(str(mask), []).append(number)
+        return True
+
+    def _terms(self, bucket):
+        return self.terms.get(bucket, {})
+
+    def _phonetic(self, bucket):
+        return self.phonetic.get(bucket, {})
+
+    def _doc(self, number):
+        return self.docs.get(number)
+
+    def meta(self):
+        return {'version': FORMAT_VERSION, 'docs': len(self.docs), 'prefix_length': self.prefix_length, 'doc_buckets': self.doc_buckets,
+                'fields': FIELD_BITS, 'weights': FIELD_WEIGHTS}
+
+    def render(self):
+        """{relative_path: bytes} for every shard; keys are sorted so unchanged buckets keep identical bytes."""
+        minify = lambda value: json.dumps(value, separators=(',', ':'), ensure_ascii=False, sort_keys=True).encode('utf-8')
+        shards = {'meta.json': minify(self.meta())}
+        for kind, buckets in (('terms', self.terms), ('phonetic', self.phonetic)):
+            for bucket, postings in buckets.items():
+                shards[f'{kind}/{bucket}.json'] = minify({term: {mask: sorted(docs) for mask, docs in by_mask.items()} for term, by_mask in postings.items()})
+        docs_by_bucket = {}
+        for number, doc in self.docs.items(): docs_by_bucket.setdefault(number % self.doc_buckets, {})[str(number)] = doc
+        for bucket, docs in docs_by_bucket.items(): shards[f'docs/{bucket:02d}.json'] = minify(docs)
+        return shards
+
+
+class ShardedSearchIndex(_Searchable):
+    """Query API over the files build_search_index() wrote; buckets are read on first use and kept."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        meta = self._load('meta.json') or {}
+        self.prefix_length, self.doc_buckets = meta.get('prefix_length', 2), meta.get('doc_buckets', 64)
+        self.doc_count = meta.get('docs', 0)
+        self._cache = {}
+
+    def _load(self, relative_path):
+        try:
+            with open(os.path.join(self.directory, relative_path), 'r', encoding='utf-8') as f: return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _shard(self, relative_path):
+        if relative_path not in self._cache: self._cache[relative_path] = self._load(relative_path) or {}
+        return self._cache[relative_path]
+
+    def _terms(self, bucket):
+        return self._shard(f'terms/{bucket}.json')
+
+    def _phonetic(self, bucket):
+        return self._shard(f'phonetic/{bucket}.json')
+
+    def _doc(self, number):
+        return self._shard(f'docs/{number % self.doc_buckets:02d}.json').get(str(number))
+
+    def doc_numbers(self):
+        """{post_id: doc number} from every docs shard on disk."""
+        numbers = {}
+        for bucket in range(self.doc_buckets):
+            for number, doc in self._shard(f'docs/{bucket:02d}.json').items(): numbers[doc[0]] = int(number)
+        return numbers
+
+
+def build_search_index(data, out_dir='data/search'):
+    index = SearchIndex.from_data(data, numbers=ShardedSearchIndex(out_dir).doc_numbers())
+    write_shards(index.render(), out_dir, label='Search index', brotli_quality=BROTLI_QUALITY)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the precomputed search index.")
+    parser.add_argument('query', nargs='+')
+    parser.add_argument('--dir', default='data/search')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--active-only', action='store_true')
+    args = parser.parse_args()
+    for result in ShardedSearchIndex(args.dir).search(' '.join(args.query), args.limit, include_archived=not args.active_only):
+        print(f"  {result['score']:6.2f}  [{result['category']}{', archived' if result['archived'] else ''}] {result['id']}: {result['title']}")
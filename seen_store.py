@@ -0,0 +1,158 @@
+# AapkaRojgar Tools - Seen-URL Store
+#
+# Every URL is reduced to a canonical key first: scheme, "www.", default
+# ports, fragments, trailing slashes and tracking parameters (utm_*, fbclid,
+# ...) are dropped and known mirror hosts are folded onto one name, so the
+# same post reached through a variant URL is not scraped and sent to the LLM
+# again. Keys live in one sorted text file that is memory-mapped and
+# binary-searched, so lookups don't need the whole history in memory. An
+# optional Bloom filter answers most misses without touching the file. New
+# keys are buffered and merged into the file once per cycle (temp file +
+# rename), which keeps git diffs to the inserted lines.
+
+import hashlib
+import heapq
+import math
+import mmap
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+HEADER = b'# seen-urls v2: canonical keys, sorted, one per line\n'
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'amp'}
+DEFAULT_PORTS = {':80', ':443'}
+
+
+def canonicalize_url(url, host_aliases=None):
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for port in DEFAULT_PORTS:
+        if host.endswith(port): host = host[:-len(port)]
+    if host.startswith('www.'): host = host[4:]
+    host = (host_aliases or {}).get(host, host)
+    path = '/'.join(segment for segment in parts.path.split('/') if segment)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS]
+    key = f"{host}/{path}" if path else host
+    return f"{key}?{urlencode(sorted(query))}" if query else key
+
+
+def _unique(sorted_keys):
+    previous = None
+    for key in sorted_keys:
+        if key != previous: yield key
+        previous = key
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1000)
+        self.size = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self._positions(key): self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SeenUrlStore:
+    def __init__(self, path, host_aliases=None, use_bloom=True):
+        self.path = path
+        self.host_aliases = host_aliases or {}
+        self.use_bloom = use_bloom
+        self.session = set()   # Found this cycle; not persisted.
+        self.pending = set()   # Finished with; merged into the file by flush().
+        self._file, self._mm, self._bloom, self._disk_count = None, None, None, 0
+        if os.path.exists(path): self._migrate_legacy_file()
+        self._open()
+
+    def _migrate_legacy_file(self):
+        with open(self.path, 'rb') as f:
+            if f.readline() == HEADER: return
+            f.seek(0)
+            keys = {canonicalize_url(line.decode('utf-8', 'replace'), self.host_aliases).encode('utf-8')
+                    for line in f if line.strip()}
+        self._write_sorted(sorted(keys))
+        print(f"  -> Migrated {self.path} to the canonical sorted format ({len(keys)} unique URLs).")
+
+    def _write_sorted(self, sorted_keys):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER)
+            for key in sorted_keys: f.write(key + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.close()  # The old file may still be mapped; release it before the rename.
+        os.replace(tmp_path, self.path)
+
+    def _open(self):
+        self.close()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= len(HEADER): return
+        self._file = open(self.path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._disk_count = sum(chunk.count(b'\n') for chunk in iter(lambda: self._file.read(1 << 20), b'')) - 1
+        if self.use_bloom:
+            self._bloom = BloomFilter(self._disk_count)
+            for key in self._disk_keys(): self._bloom.add(key)
+
+    def close(self):
+        if self._mm: self._mm.close()
+        if self._file: self._file.close()
+        self._file, self._mm, self._bloom, self._disk_count = None, None, None, 0
+
+    def _disk_keys(self):
+        if not self._mm: return
+        self._mm.seek(len(HEADER))
+        for line in iter(self._mm.readline, b''): yield line.rstrip(b'\n')
+
+    def _on_disk(self, key):
+        mm = self._mm
+        if not mm or (self._bloom is not None and key not in self._bloom): return False
+        lo, hi = len(HEADER), len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = max(lo, mm.rfind(b'\n', lo, mid) + 1)
+            line_end = mm.find(b'\n', line_start)
+            if line_end == -1: line_end = len(mm)
+            line = mm[line_start:line_end]
+            if line == key: return True
+            if line < key: lo = line_end + 1
+            else: hi = line_start
+        return False
+
+    def canonical(self, url):
+        return canonicalize_url(url, self.host_aliases)
+
+    def __contains__(self, url):
+        key = self.canonical(url)
+        return key in self.session or key in self.pending or self._on_disk(key.encode('utf-8'))
+
+    def __len__(self):
+        return self._disk_count + len(self.pending)
+
+    def add(self, url):
+        """Remember a URL for the rest of this cycle only."""
+        self.session.add(self.canonical(url))
+
+    def record(self, url):
+        """Mark a URL as permanently seen; written on the next flush()."""
+        key = self.canonical(url)
+        self.session.add(key)
+        if not self._on_disk(key.encode('utf-8')): self.pending.add(key)
+
+    def flush(self):
+        if not self.pending: return 0
+        new_keys = sorted(key.encode('utf-8') for key in self.pending)
+        # heapq.merge streams the existing file, so only the new keys are held in memory.
+        self._write_sorted(_unique(heapq.merge(self._disk_keys(), new_keys)))
+        written = len(new_keys)
+        self.pending.clear()
+        self._open()
+        return written
@@ -0,0 +1,96 @@
+# AapkaRojgar Tools - Sharded Static Data Build
+#
+# Splits data.json into the small files the pages actually need:
+#   data/index.json              list fields for every active category (home page)
+#   data/index/<category>.json   list fields for one category (list pages)
+#   data/posts/<id>.json         one minified post (detail pages)
+# Every shard also gets precompressed .gz (and .br when brotli is installed)
+# variants. A manifest of content hashes makes rebuilds incremental: only
+# shards whose bytes changed are rewritten, and shards that no longer exist
+# (e.g. archived posts) are deleted.
+
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+LIST_FIELDS = ('id', 'title', 'last_date', 'new')
+SAFE_ID_RE = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,150}$')
+MANIFEST_NAME = 'manifest.json'
+
+
+def _minify(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _list_item(item):
+    return {field: item.get(field) for field in LIST_FIELDS if field in item}
+
+
+def render_shards(data):
+    """Return {relative_path: bytes} for every shard derived from the active (non-archived) data."""
+    shards, home_index = {}, {}
+    for category, items in data.items():
+        if category == 'archived_content' or not isinstance(items, list): continue
+        listing = [_list_item(item) for item in items if isinstance(item, dict)]
+        home_index[category] = listing
+        shards[f'index/{category}.json'] = _minify(listing)
+        for item in items:
+            post_id = item.get('id') if isinstance(item, dict) else None
+            if isinstance(post_id, str) and SAFE_ID_RE.match(post_id) and f'posts/{post_id}.json' not in shards:
+                shards[f'posts/{post_id}.json'] = _minify(item)
+    shards['index.json'] = _minify(home_index)
+    return shards
+
+
+def _write_atomic(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f: f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _variants(relative_path, payload, brotli_quality=11):
+    yield relative_path, payload
+    yield relative_path + '.gz', gzip.compress(payload, compresslevel=9, mtime=0)
+    if brotli: yield relative_path + '.br', brotli.compress(payload, quality=brotli_quality)
+
+
+def build_static_shards(data, out_dir='data'):
+    return write_shards(render_shards(data), out_dir)
+
+
+def write_shards(shards, out_dir, label='Static shards', brotli_quality=11):
+    """Write {relative_path: bytes} under out_dir, touching only changed shards; out_dir gets its own manifest."""
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f: old_manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        old_manifest = {}
+    new_manifest, written = {}, 0
+    for relative_path, payload in shards.items():
+        digest = hashlib.sha256(payload).hexdigest()[:16]
+        new_manifest[relative_path] = digest
+        expected_paths = [os.path.join(out_dir, variant_path) for variant_path, _ in _variants(relative_path, b'')]
+        if old_manifest.get(relative_path) == digest and all(os.path.exists(path) for path in expected_paths): continue
+        for variant_path, variant_payload in _variants(relative_path, payload, brotli_quality):
+            _write_atomic(os.path.join(out_dir, variant_path), variant_payload)
+        stale_brotli = os.path.join(out_dir, relative_path + '.br')
+        if not brotli and os.path.exists(stale_brotli): os.remove(stale_brotli)
+        written += 1
+    removed = 0
+    for relative_path in old_manifest.keys() - new_manifest.keys():
+        for suffix in ('', '.gz', '.br'):
+            stale_path = os.path.join(out_dir, relative_path + suffix)
+            if os.path.exists(stale_path): os.remove(stale_path)
+        removed += 1
+    if written or removed or old_manifest != new_manifest:
+        _write_atomic(manifest_path, _minify(dict(sorted(new_manifest.items()))))
+    print(f"  -> {label}: {written} written, {removed} removed, {len(new_manifest) - written} unchanged.")
+    return written, removed
@@ -0,0 +1,193 @@
+# AapkaRojgar Tools - Run Telemetry
+#
+# One JSON line per event (an HTTP fetch, a parse, a model call, a data.json
+# load or save, ...) plus one summary line per cycle, appended to a
+# size-rotated JSONL file. Timed sections use span(), which records their
+# duration in seconds. When telemetry is off the scraper holds a
+# NullTelemetry whose methods do nothing and whose span() hands back one
+# shared no-op context manager, so the instrumented hot paths cost a method
+# call and nothing more.
+#
+# Run `python telemetry.py [log.jsonl ...]` to summarise the logs (rotated
+# backups included) into per-phase and per-source percentile tables.
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from logging import Formatter, Logger
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_LOG_PATH = 'telemetry/run_telemetry.jsonl'
+NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ('telemetry', 'name', 'fields', 'started')
+
+    def __init__(self, telemetry, name, fields):
+        self.telemetry, self.name, self.fields = telemetry, name, fields
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type: self.fields['error'] = exc_type.__name__
+        self.telemetry.event(self.name, seconds=time.perf_counter() - self.started, **self.fields)
+
+
+class Telemetry:
+    enabled = True
+
+    def __init__(self, path, max_bytes=2_000_000, backups=3):
+        self.path = path
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A private Logger (not registered with logging's manager) so nothing else can propagate into the file.
+        self._logger = Logger('scraper.telemetry')
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True)
+        handler.setFormatter(Formatter('%(message)s'))
+        self._logger.addHandler(handler)
+        self._lock = threading.Lock()
+        self.cycle_id, self._cycle_started = None, None
+        self._phases, self._counters = {}, {}
+
+    def start_cycle(self):
+        with self._lock:
+            self.cycle_id = datetime.now().strftime('%Y%m%dT%H%M%S-') + uuid.uuid4().hex[:6]
+            self._cycle_started = time.perf_counter()
+            self._phases, self._counters = {}, {}
+
+    def event(self, name, seconds=None, **fields):
+        record = {'ts': round(time.time(), 3), 'cycle': self.cycle_id, 'event': name}
+        if seconds is not None: record['seconds'] = round(seconds, 6)
+        record.update(fields)
+        with self._lock:
+            if seconds is not None: self._phases.setdefault(name, []).append(seconds)
+        self._logger.info(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str))
+
+    def span(self, name, **fields):
+        return _Span(self, name, fields)
+
+    def count(self, name, amount=1):
+        with self._lock: self._counters[name] = self._counters.get(name, 0) + amount
+
+    def end_cycle(self, **fields):
+        if self._cycle_started is None: return
+        with self._lock:
+            phases = {name: {'count': len(durations), 'total_s': round(sum(durations), 6), 'p50_s': round(percentile(durations, 0.50), 6),
+                             'max_s': round(max(durations), 6)} for name, durations in sorted(self._phases.items())}
+            counters, seconds = dict(sorted(self._counters.items())), time.perf_counter() - self._cycle_started
+        self.event('cycle_summary', seconds=seconds, phases=phases, counters=counters, **fields)
+        self._cycle_started = None
+
+    def close(self):
+        for handler in list(self._logger.handlers):
+            handler.close()
+            self._logger.removeHandler(handler)
+
+
+class NullTelemetry:
+    enabled = False
+    cycle_id = None
+
+    def start_cycle(self): pass
+    def event(self, name, seconds=None, **fields): pass
+    def span(self, name, **fields): return NULL_SPAN
+    def count(self, name, amount=1): pass
+    def end_cycle(self, **fields): pass
+    def close(self): pass
+
+
+def percentile(samples, fraction):
+    if not samples: return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+# --- Reporting ---
+def log_files(path):
+    """The live log and its rotated backups, oldest first."""
+    backups = [f"{path}.{n}" for n in range(1, 100) if os.path.exists(f"{path}.{n}")]
+    return list(reversed(backups)) + ([path] if os.path.exists(path) else [])
+
+
+def read_events(paths):
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A line cut short by a crash or a rotation mid-write.
+
+
+def _table(title, header, rows):
+    print(f"\n{title}")
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    for row in [header] + rows: print('  ' + '  '.join(str(cell).rjust(width) if i else str(cell).ljust(width) for i, (cell, width) in enumerate(zip(row, widths))))
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}" if seconds is not None else '-'
+
+
+def summarize(events, last_cycles=None):
+    events = [event for event in events if event.get('cycle')]
+    cycles = list(dict.fromkeys(event['cycle'] for event in events))
+    if last_cycles: cycles = cycles[-last_cycles:]
+    wanted = set(cycles)
+    events = [event for event in events if event['cycle'] in wanted]
+    if not events: print("No telemetry events found."); return
+    summaries = [event for event in events if event['event'] == 'cycle_summary']
+    print(f"{len(cycles)} cycle(s), {len(events)} event(s).")
+    durations = [summary['seconds'] for summary in summaries]
+    if durations: print(f"Cycle duration: p50 {percentile(durations, 0.5):.1f}s, p95 {percentile(durations, 0.95):.1f}s, max {max(durations):.1f}s.")
+
+    by_phase = {}
+    for event in events:
+        if 'seconds' in event and event['event'] != 'cycle_summary': by_phase.setdefault(event['event'], []).append(event['seconds'])
+    _table("Per phase (ms):", ['phase', 'count', 'p50', 'p95', 'max', 'total_s'],
+           [[name, len(samples), _ms(percentile(samples, 0.5)), _ms(percentile(samples, 0.95)), _ms(max(samples)), f"{sum(samples):.1f}"]
+            for name, samples in sorted(by_phase.items(), key=lambda item: -sum(item[1]))])
+
+    by_host = {}
+    for event in events:
+        if event['event'] not in ('fetch', 'parse_listing', 'parse_article'): continue
+        stats = by_host.setdefault(event.get('host', '?'), {'seconds': [], 'parse': [], 'bytes': 0, 'errors': 0})
+        if event['event'] != 'fetch': stats['parse'].append(event.get('seconds', 0.0)); continue
+        stats['seconds'].append(event.get('seconds', 0.0))
+        stats['bytes'] += event.get('bytes', 0)
+        stats['errors'] += 1 if event.get('error') else 0
+    if by_host:
+        _table("Per source (ms):", ['host', 'requests', 'errors', 'fetch p50', 'fetch p95', 'fetch max', 'parse p50', 'parse p95', 'KiB'],
+               [[host, len(stats['seconds']), stats['errors'], _ms(percentile(stats['seconds'], 0.5)), _ms(percentile(stats['seconds'], 0.95)),
+                 _ms(max(stats['seconds'], default=None)), _ms(percentile(stats['parse'], 0.5)), _ms(percentile(stats['parse'], 0.95)),
+                 stats['bytes'] // 1024] for host, stats in sorted(by_host.items())])
+
+    calls = [event for event in events if event['event'] == 'llm' and not event.get('cached')]
+    if calls:
+        latencies = [event.get('seconds', 0.0) for event in calls]
+        prompts, responses = [event.get('prompt_chars', 0) for event in calls], [event.get('response_chars', 0) for event in calls]
+        _table("Model calls:", ['calls', 'p50 ms', 'p95 ms', 'retries', 'transient', 'prompt p50/p95', 'response p50/p95'],
+               [[len(calls), _ms(percentile(latencies, 0.5)), _ms(percentile(latencies, 0.95)),
+                 sum(max(0, event.get('attempts', 1) - 1) for event in calls), sum(1 for event in calls if event.get('transient')),
+                 f"{percentile(prompts, 0.5)}/{percentile(prompts, 0.95)}", f"{percentile(responses, 0.5)}/{percentile(responses, 0.95)}"]])
+
+    counters = {}
+    for summary in summaries:
+        for name, value in summary.get('counters', {}).items(): counters[name] = counters.get(name, 0) + value
+    if counters: _table("Counters (all cycles):", ['counter', 'total'], [[name, value] for name, value in sorted(counters.items())])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise scraper run telemetry.")
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_LOG_PATH], help="Log file(s); rotated backups are read too.")
+    parser.add_argument('--cycles', type=int, help="Only the most recent N cycles.")
+    args = parser.parse_args()
+    summarize(read_events(path for log in args.paths for path in log_files(log)), args.cycles)
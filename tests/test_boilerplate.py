@@ -0,0 +1,76 @@
+import os
+
+import scraper
+from boilerplate import BoilerplateLearner, _line_key
+from grouping import FingerprintIndex
+
+VACANCY_TABLE = "\n".join([
+    "UP Police Constable and Driver Recruitment 2026 Vacancy Details",
+    "Post Name", "UR", "OBC", "SC",
+    "Constable", "100", "50", "20",
+    "Driver", "100", "50", "20",
+])
+TEMPLATE = ["Join our Telegram channel for the latest sarkari job alerts", "Related Posts: SSC GD, RRB NTPC, UP Police, Bihar Police",
+            "Copyright 2026 Sarkari Result. All rights reserved by the site."]
+
+
+def make_learner(tmp_path):
+    return BoilerplateLearner(os.path.join(tmp_path, 'boilerplate.json'), min_pages=2, min_ratio=0.5)
+
+
+def test_fit_group_keeps_repeated_table_cells_within_one_article(tmp_path):
+    article = {'url': 'https://mirror-a.com/up-police/', 'content': VACANCY_TABLE}
+    assert make_learner(tmp_path).fit_group([article], token_budget=None) == [VACANCY_TABLE]
+
+
+def test_fit_group_drops_long_lines_repeated_from_an_earlier_article(tmp_path):
+    shared = "Application Fee: General / OBC 400/- and SC / ST 400/- through net banking"
+    first = {'url': 'https://mirror-a.com/up-police/', 'content': VACANCY_TABLE + "\n" + shared}
+    second = {'url': 'https://mirror-b.com/up-police/', 'content': shared + "\n" + VACANCY_TABLE}
+    contents = make_learner(tmp_path).fit_group([first, second], token_budget=None)
+    # The second copy loses the long lines (fee, heading) but keeps every table cell.
+    assert contents == [first['content'], VACANCY_TABLE.split('\n', 1)[1]]
+
+
+def test_articles_left_empty_by_stripping_are_rejected(tmp_path):
+    learner = make_learner(tmp_path)
+    pages = [{'title': f"Template page {i}", 'url': f"https://mirror-a.com/post-{i}/", 'source': 'https://mirror-a.com/',
+              'content': "\n".join(TEMPLATE * 3)} for i in range(3)]
+    processed_urls = []
+    fingerprints = FingerprintIndex(os.path.join(tmp_path, 'fingerprints.json'))
+    deferred = scraper.process_new_articles(pages, None, fingerprints, learner, processed_urls)
+    assert deferred == set()
+    assert processed_urls == [page['url'] for page in pages]
+
+
+def observe_pages(learner, start, count, footer, batch=20):
+    for first in range(start, start + count, batch):
+        for i in range(first, first + batch):
+            learner.observe(f"https://mirror-a.com/post-{i}/", f"Post {i} body text that is long enough to count\n{footer}")
+        learner.save()
+
+
+def test_changed_template_is_learned_within_the_window(tmp_path):
+    old_footer, new_footer = TEMPLATE[0], "Join our WhatsApp channel for the latest sarkari job alerts"
+    learner = BoilerplateLearner(os.path.join(tmp_path, 'boilerplate.json'), min_pages=3, min_ratio=0.6, window_pages=200)
+    observe_pages(learner, 0, 2000, old_footer)
+    assert learner.hosts['mirror-a.com']['pages'] == 200
+    observe_pages(learner, 2000, 200, new_footer)
+    # Without the window the new footer would need 3000 more pages to reach 60% of a 2000-page history.
+    assert learner.is_boilerplate('mirror-a.com', new_footer)
+    assert not learner.is_boilerplate('mirror-a.com', old_footer)
+    reloaded = BoilerplateLearner(learner.path, min_pages=3, min_ratio=0.6, window_pages=200)
+    assert reloaded.is_boilerplate('mirror-a.com', new_footer)
+
+
+def test_pruning_keeps_lines_first_seen_this_run(tmp_path):
+    path = os.path.join(tmp_path, 'boilerplate.json')
+    learner = BoilerplateLearner(path, max_lines_per_host=3)
+    learner.observe('https://mirror-a.com/old/', "\n".join(TEMPLATE))
+    learner.save()
+    learner = BoilerplateLearner(path, max_lines_per_host=3)
+    new_lines = ["A brand new sidebar line added to the template", "Another new widget line on every single page"]
+    learner.observe('https://mirror-a.com/new/', "\n".join(new_lines))
+    learner.save()
+    kept = BoilerplateLearner(path).hosts['mirror-a.com']['lines']
+    assert len(kept) == 3 and all(key in kept for key in map(_line_key, new_lines))
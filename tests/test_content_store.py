@@ -0,0 +1,77 @@
+import json
+import os
+
+from content_store import ARCHIVE_KEY, ContentStore, empty_data, write_json_atomic
+
+
+def job(post_id):
+    return {'id': post_id, 'title': post_id, 'last_date': '2026-03-01'}
+
+
+def make_store(tmp_path, data=None, **callbacks):
+    path = os.path.join(tmp_path, 'data.json')
+    if data is not None: write_json_atomic(path, data, indent=2, ensure_ascii=False)
+    return ContentStore(path, **callbacks)
+
+
+def read_back(store):
+    with open(store.path, 'r', encoding='utf-8') as f: return json.load(f)
+
+
+def sample_data():
+    data = empty_data()
+    data['latest_jobs'] = [job('ssc-gd-2026')]
+    data[ARCHIVE_KEY]['result'] = [job('rrb-ntpc-result-2024')]
+    return data
+
+
+def test_missing_file_starts_empty(tmp_path):
+    store = make_store(tmp_path)
+    assert store.data == empty_data() and store.digest is None
+    assert not store.commit()  # Nothing changed, nothing written.
+    assert not os.path.exists(store.path)
+
+
+def test_ids_are_indexed_across_active_and_archived_posts(tmp_path):
+    store = make_store(tmp_path, sample_data())
+    assert store.location('ssc-gd-2026') == 'latest_jobs'
+    assert store.location('rrb-ntpc-result-2024') == f'{ARCHIVE_KEY}.result'
+    assert 'unknown-post' not in store
+
+
+def test_insert_rejects_ids_already_archived(tmp_path):
+    store = make_store(tmp_path, sample_data())
+    assert not store.insert('result', job('rrb-ntpc-result-2024'))
+    assert not store.insert('admit_card', job('ssc-gd-2026'))
+    assert not store.dirty and store.data['result'] == []
+
+
+def test_commit_writes_once_and_calls_hooks(tmp_path):
+    inserted, committed = [], []
+    store = make_store(tmp_path, sample_data(), on_insert=lambda category, entry: inserted.append((category, entry['id'])),
+                       on_commit=committed.append)
+    assert store.insert('latest_jobs', job('up-police-2026'))
+    assert inserted == [('latest_jobs', 'up-police-2026')]
+    assert store.commit()
+    assert [item['id'] for item in read_back(store)['latest_jobs']] == ['up-police-2026', 'ssc-gd-2026']
+    assert len(committed) == 1 and committed[0] is store.data
+    assert not store.commit()  # Clean again until the next change.
+    assert not os.path.exists(store.path + '.tmp')
+
+
+def test_archive_moves_posts_and_reindexes(tmp_path):
+    store = make_store(tmp_path, sample_data())
+    store.archive('latest_jobs', [store.get('ssc-gd-2026')])
+    store.commit()
+    saved = read_back(store)
+    assert saved['latest_jobs'] == [] and saved[ARCHIVE_KEY]['latest_jobs'] == [job('ssc-gd-2026')]
+    reloaded = make_store(tmp_path)
+    assert reloaded.location('ssc-gd-2026') == f'{ARCHIVE_KEY}.latest_jobs'
+    assert not reloaded.insert('latest_jobs', job('ssc-gd-2026'))
+
+
+def test_digest_tracks_the_bytes_on_disk(tmp_path):
+    store = make_store(tmp_path, sample_data())
+    store.insert('latest_jobs', job('up-police-2026'))
+    store.commit()
+    assert make_store(tmp_path).digest == store.digest
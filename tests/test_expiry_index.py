@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+import scraper
+from content_store import empty_data, write_json_atomic
+
+
+def job(post_id, last_date):
+    return {'id': post_id, 'title': post_id, 'type': 'job', 'last_date': last_date, 'creation_date': '2026-01-01'}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = empty_data()
+    data['latest_jobs'].append(job('ssc-gd-2026', '2026-02-01'))
+    write_json_atomic(scraper.DATA_JSON_FILE, data, indent=2, ensure_ascii=False)
+    return tmp_path
+
+
+def scheduled_ids(store):
+    return sorted(post_id for _, _, post_id in store.expiry.heap)
+
+
+def test_commit_keeps_index_in_step(workdir):
+    store = scraper.load_content_store()
+    store.insert('latest_jobs', job('up-police-2026', '2026-03-01'))
+    store.commit()
+    reloaded = scraper.load_content_store()
+    assert reloaded.expiry.matches(reloaded.digest)
+    assert scheduled_ids(reloaded) == ['ssc-gd-2026', 'up-police-2026']
+
+
+def test_crash_between_data_and_index_writes_rebuilds_index(workdir):
+    store = scraper.load_content_store()
+    store.on_commit = None  # data.json is written, then the process dies before the index is saved.
+    store.insert('latest_jobs', job('up-police-2026', '2026-03-01'))
+    store.commit()
+    assert scheduled_ids(scraper.load_content_store()) == ['ssc-gd-2026', 'up-police-2026']
+
+
+def test_write_outside_the_store_rebuilds_index(workdir):
+    scraper.load_content_store()
+    with open(scraper.DATA_JSON_FILE, 'r', encoding='utf-8') as f: data = json.load(f)
+    data['latest_jobs'].insert(0, job('bihar-police-2026', '2026-04-01'))
+    write_json_atomic(scraper.DATA_JSON_FILE, data, indent=2, ensure_ascii=False)
+    assert scheduled_ids(scraper.load_content_store()) == ['bihar-police-2026', 'ssc-gd-2026']
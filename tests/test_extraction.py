@@ -0,0 +1,106 @@
+import os
+from http import HTTPStatus
+
+import pytest
+
+from extraction import DeferralLedger, ExtractionExecutor, FakeBackend, is_transient_error
+
+
+class InvalidArgument(Exception):
+    code = HTTPStatus.BAD_REQUEST
+
+
+class ServiceUnavailable(Exception):
+    code = HTTPStatus.SERVICE_UNAVAILABLE
+
+
+class ApiError(Exception):
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+
+class RpcError(Exception):
+    def code(self):
+        return 14
+
+
+@pytest.mark.parametrize('error', [
+    InvalidArgument("400 The input token count (1250043) exceeds the maximum number of tokens allowed (1048576)."),
+    InvalidArgument("400 max_output_tokens must be at most 8192, got 5000"),
+    ApiError("quota exceeded for 500 requests, rate limit: timeout", 403),
+    ValueError("500 Internal error while timing out"),
+    RpcError("unavailable"),
+])
+def test_permanent_errors_are_not_transient(error):
+    assert not is_transient_error(error)
+
+
+@pytest.mark.parametrize('error', [
+    ServiceUnavailable("503 The model is overloaded."),
+    ApiError("Resource has been exhausted", 429),
+    ApiError("Bad gateway", '502'),
+    type('ResourceExhausted', (Exception,), {})("429 Quota exceeded"),
+    TimeoutError("read timed out"),
+    ConnectionError("connection reset"),
+])
+def test_transient_errors(error):
+    assert is_transient_error(error)
+
+
+def failing_executor(error):
+    def responder(prompt):
+        raise error
+    executor = ExtractionExecutor(FakeBackend(responder), 'PROMPT', requests_per_minute=0, max_retries=2, base_delay=0.0)
+    return executor, executor.backend
+
+
+def test_permanent_error_is_not_retried():
+    executor, backend = failing_executor(InvalidArgument("400 input token count (1250043) exceeds 500"))
+    result = executor.extract('content')
+    assert (result.transient, result.attempts, backend.calls) == (False, 1, 1)
+
+
+def test_transient_error_is_retried_then_reported():
+    executor, backend = failing_executor(ServiceUnavailable("503 overloaded"))
+    result = executor.extract('content')
+    assert (result.transient, result.attempts, backend.calls) == (True, 3, 3)
+
+
+def test_ledger_allows_max_deferrals_then_gives_up(tmp_path):
+    path = os.path.join(tmp_path, 'llm_deferrals.json')
+    urls = ['https://mirror-a.com/post/', 'https://mirror-b.com/post/']
+    ledger = DeferralLedger(path, max_deferrals=2)
+    assert ledger.defer(urls) and ledger.defer(urls)
+    ledger.save()
+    reloaded = DeferralLedger(path, max_deferrals=2)
+    assert not reloaded.defer(urls)
+    reloaded.forget(urls)
+    assert reloaded.defer(urls)
+
+
+def test_ledger_gives_up_when_any_url_is_exhausted(tmp_path):
+    ledger = DeferralLedger(os.path.join(tmp_path, 'llm_deferrals.json'), max_deferrals=1)
+    assert ledger.defer(['https://mirror-a.com/post/'])
+    assert not ledger.defer(['https://mirror-a.com/post/', 'https://mirror-b.com/post/'])
+
+
+def test_group_is_marked_seen_once_its_deferrals_run_out(tmp_path, monkeypatch):
+    import scraper
+    from boilerplate import BoilerplateLearner
+    from grouping import FingerprintIndex
+    monkeypatch.chdir(tmp_path)
+    executor, _ = failing_executor(ServiceUnavailable("503 overloaded"))
+    executor.max_retries = 0
+    monkeypatch.setattr(scraper, 'get_extraction_executor', lambda: executor)
+    ledger = DeferralLedger('llm_deferrals.json', max_deferrals=2)
+    article = {'title': 'UP Police Constable Recruitment 2026', 'url': 'https://mirror-a.com/up-police-2026/', 'source': 'https://mirror-a.com/',
+               'content': "UP Police Constable Recruitment 2026 notification for 19220 posts, apply online.\n" * 5}
+    outcomes = []
+    for _ in range(3):
+        processed_urls = []
+        deferred = scraper.process_new_articles([dict(article)], None, FingerprintIndex('fingerprints.json'),
+                                                BoilerplateLearner('boilerplate.json'), processed_urls, ledger)
+        outcomes.append((deferred, processed_urls))
+    assert outcomes == [({article['source']}, []), ({article['source']}, []), (set(), [article['url']])]
+    assert ledger.urls == {}
@@ -0,0 +1,85 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+from fetcher import FetchEngine
+
+REQUEST_SECONDS = 0.1
+
+
+class StubResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, url):
+        self.content = url.encode('utf-8')
+
+    def raise_for_status(self):
+        pass
+
+
+class StubSession:
+    """Stands in for requests.Session: every GET takes REQUEST_SECONDS and in-flight counts are tracked."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight, self.per_host = 0, {}
+        self.max_in_flight, self.max_per_host = 0, {}
+        self.finished = {}
+
+    def get(self, url, timeout=None, headers=None):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self.in_flight += 1
+            self.per_host[host] = self.per_host.get(host, 0) + 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.max_per_host[host] = max(self.max_per_host.get(host, 0), self.per_host[host])
+        time.sleep(REQUEST_SECONDS)
+        with self._lock:
+            self.in_flight -= 1
+            self.per_host[host] -= 1
+            self.finished[url] = time.perf_counter()
+        return StubResponse(url)
+
+    def close(self):
+        pass
+
+
+def make_engine():
+    engine = FetchEngine(max_workers=8, max_per_host=2, host_delay=0.0)
+    engine.session = StubSession()
+    return engine
+
+
+def test_hosts_share_the_pool_up_to_the_global_cap():
+    urls = [f"https://mirror-{host}.com/post-{i}/" for host in range(4) for i in range(12)]
+    with make_engine() as engine:
+        started = time.perf_counter()
+        results = engine.fetch_all(urls)
+        elapsed = time.perf_counter() - started
+        session = engine.session
+    assert [result.content for result in results] == [url.encode('utf-8') for url in urls]
+    assert session.max_in_flight == 8
+    assert max(session.max_per_host.values()) == 2
+    # 48 requests, 8 at a time: 6 rounds. Workers blocked on a busy host would take about twice as long.
+    assert elapsed < 6 * REQUEST_SECONDS * 1.5
+
+
+def test_busy_host_does_not_hold_back_other_hosts():
+    busy = [f"https://busy.com/post-{i}/" for i in range(12)]
+    quiet = [f"https://quiet.com/post-{i}/" for i in range(4)]
+    with make_engine() as engine:
+        started = time.perf_counter()
+        engine.fetch_all(busy + quiet)
+        session = engine.session
+    # The quiet host gets its own two slots at once, so its four URLs finish in two rounds.
+    assert max(session.finished[url] for url in quiet) - started < 2 * REQUEST_SECONDS * 1.5
+    assert session.max_per_host == {'busy.com': 2, 'quiet.com': 2}
+
+
+def test_close_cancels_urls_still_waiting_for_a_slot():
+    engine = make_engine()
+    futures = [engine.submit(f"https://busy.com/post-{i}/") for i in range(6)]
+    engine.close()
+    assert [future.cancelled() for future in futures] == [False, False, True, True, True, True]
+    assert all(future.result().ok for future in futures[:2])
@@ -0,0 +1,46 @@
+import os
+
+from grouping import FingerprintIndex
+
+SHARED_BLOCKS = "\n".join([
+    "Application Fee: General / OBC / EWS 100/- SC / ST / Female 0/- Pay the exam fee through debit card, credit card or net banking.",
+    "Age Limit as on 01/01/2026: Minimum Age 18 Years, Maximum Age 25 Years. Age relaxation extra as per recruitment rules.",
+    "Vacancy Details: Constable GD 3500 posts, Constable Driver 1200 posts, Head Constable Ministerial 800 posts, total 5500 posts.",
+    "Eligibility: Class 10 High School exam passed from any recognised board in India, physical standard as per notification.",
+    "Selection process: written exam, physical efficiency test, physical standard test, document verification and medical exam.",
+])
+RECRUITMENT_PAGE = "UP Police Constable Recruitment 2026 Apply Online for 5500 Posts\nImportant Dates: Apply start 01/02/2026, last date 28/02/2026.\n" + SHARED_BLOCKS
+ADMIT_CARD_PAGE = "UP Police Constable Admit Card 2026 Download Exam Date Out\nImportant Dates: Exam date 20/04/2026, admit card available 10/04/2026.\n" + SHARED_BLOCKS
+
+
+def make_index(tmp_path):
+    return FingerprintIndex(os.path.join(tmp_path, 'fingerprints.json'))
+
+
+def test_repost_on_another_mirror_is_matched(tmp_path):
+    index = make_index(tmp_path)
+    index.add('up-police-constable-2026', index.signature(RECRUITMENT_PAGE), 'mirror-a.com')
+    post_id, score = index.match(index.signature(RECRUITMENT_PAGE), 'mirror-b.com')
+    assert post_id == 'up-police-constable-2026' and score >= index.threshold
+
+
+def test_same_exam_update_on_same_host_is_kept(tmp_path):
+    index = make_index(tmp_path)
+    index.add('up-police-constable-2026', index.signature(RECRUITMENT_PAGE), 'mirror-a.com')
+    assert index.match(index.signature(ADMIT_CARD_PAGE), 'mirror-a.com') == (None, 0.0)
+    assert index.match(index.signature(RECRUITMENT_PAGE), 'mirror-a.com') == (None, 0.0)
+
+
+def test_same_exam_update_on_another_mirror_is_below_threshold(tmp_path):
+    index = make_index(tmp_path)
+    index.add('up-police-constable-2026', index.signature(RECRUITMENT_PAGE), 'mirror-a.com')
+    assert index.match(index.signature(ADMIT_CARD_PAGE), 'mirror-b.com') == (None, 0.0)
+
+
+def test_hosts_survive_a_reload(tmp_path):
+    index = make_index(tmp_path)
+    index.add('up-police-constable-2026', index.signature(RECRUITMENT_PAGE), 'mirror-a.com')
+    index.save()
+    reloaded = make_index(tmp_path)
+    assert reloaded.match(reloaded.signature(RECRUITMENT_PAGE), 'mirror-a.com') == (None, 0.0)
+    assert reloaded.match(reloaded.signature(RECRUITMENT_PAGE), 'mirror-b.com')[0] == 'up-police-constable-2026'
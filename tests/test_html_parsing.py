@@ -0,0 +1,55 @@
+import glob
+import os
+
+import pytest
+
+import scraper
+from html_parsing import available_backends, iter_anchors
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+FAST_BACKENDS = [backend for backend in available_backends() if backend != 'html.parser']
+# Pages the fast backends are known to parse differently (see test_known_divergences); they keep PARSER_BACKEND on html.parser.
+DIVERGENT_FIXTURES = {'listing_nested_anchor.html'}
+
+
+def fixture_pages(prefix):
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, f'{prefix}*.html')))
+    return [path for path in paths if os.path.basename(path) not in DIVERGENT_FIXTURES]
+
+
+def read(path):
+    with open(path, 'rb') as f: return f.read()
+
+
+def article_text(path, backend, monkeypatch):
+    monkeypatch.setattr(scraper, 'PARSER_BACKEND', backend)
+    return scraper.parse_article_page('https://sarkariresult.com.cm/post/', read(path))
+
+
+@pytest.mark.parametrize('backend', FAST_BACKENDS)
+@pytest.mark.parametrize('path', fixture_pages('listing') + fixture_pages('article'), ids=os.path.basename)
+def test_anchors_match_html_parser(path, backend):
+    assert list(iter_anchors(read(path), backend)) == list(iter_anchors(read(path), 'html.parser'))
+
+
+@pytest.mark.parametrize('backend', FAST_BACKENDS)
+@pytest.mark.parametrize('path', fixture_pages('article'), ids=os.path.basename)
+def test_article_text_matches_html_parser(path, backend, monkeypatch):
+    assert article_text(path, backend, monkeypatch) == article_text(path, 'html.parser', monkeypatch)
+
+
+def divergent_pages():
+    # A nested <a> is closed early, and CRLF inside link text is normalised to LF.
+    yield 'nested_anchor', read(os.path.join(FIXTURES_DIR, 'listing_nested_anchor.html'))
+    yield 'crlf', read(os.path.join(FIXTURES_DIR, 'listing_list.html')).replace(b'\n', b'\r\n')
+
+
+@pytest.mark.xfail(strict=True, reason="fast backends repair this markup differently from html.parser")
+@pytest.mark.parametrize('backend', FAST_BACKENDS)
+@pytest.mark.parametrize('name,html_content', list(divergent_pages()), ids=[name for name, _ in divergent_pages()])
+def test_known_divergences(name, html_content, backend):
+    assert list(iter_anchors(html_content, backend)) == list(iter_anchors(html_content, 'html.parser'))
+
+
+def test_scraper_defaults_to_html_parser():
+    assert scraper.PARSER_BACKEND == 'html.parser'
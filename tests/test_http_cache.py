@@ -0,0 +1,61 @@
+import os
+
+from fetcher import FetchResult
+from http_cache import ResponseCache
+
+SOURCE = 'https://sarkariresult.com.cm/'
+
+
+def make_cache(tmp_path, max_entries=500):
+    return ResponseCache(os.path.join(tmp_path, 'http_cache.json'), max_entries=max_entries)
+
+
+def page(body, status_code=200, headers=None, url=SOURCE):
+    return FetchResult(url, body, status_code, headers or {})
+
+
+def test_first_fetch_is_changed_and_remembers_validators(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.conditional_headers(SOURCE) == {}
+    assert cache.check(SOURCE, page(b'<a>v1</a>', headers={'ETag': '"abc"', 'Last-Modified': 'Mon, 05 Jan 2026 10:00:00 GMT'})) == ResponseCache.CHANGED
+    assert cache.conditional_headers(SOURCE) == {'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon, 05 Jan 2026 10:00:00 GMT'}
+
+
+def test_not_modified_unchanged_and_changed(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.check(SOURCE, page(b'<a>v1</a>', headers={'ETag': '"abc"'}))
+    assert cache.check(SOURCE, page(b'', status_code=304)) == ResponseCache.NOT_MODIFIED
+    assert cache.conditional_headers(SOURCE) == {'If-None-Match': '"abc"'}  # A 304 keeps the stored validators.
+    assert cache.check(SOURCE, page(b'<a>v1</a>')) == ResponseCache.UNCHANGED
+    assert cache.check(SOURCE, page(b'<a>v2</a>')) == ResponseCache.CHANGED
+    assert cache.stats == {'requests': 4, 'not_modified': 1, 'unchanged': 1, 'changed': 2, 'evicted': 0}
+
+
+def test_304_without_an_entry_counts_as_changed(tmp_path):
+    assert make_cache(tmp_path).check(SOURCE, page(b'', status_code=304)) == ResponseCache.CHANGED
+
+
+def test_forget_makes_the_next_fetch_changed(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.check(SOURCE, page(b'<a>v1</a>'))
+    cache.forget(SOURCE)
+    assert cache.check(SOURCE, page(b'<a>v1</a>')) == ResponseCache.CHANGED
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, max_entries=2)
+    for now, url in enumerate(['https://a.com/', 'https://b.com/', 'https://a.com/', 'https://c.com/']):
+        monkeypatch.setattr('http_cache.time.time', lambda now=now: 1_700_000_000 + now)
+        cache.check(url, page(b'body', url=url))
+    assert sorted(cache.entries) == ['https://a.com/', 'https://c.com/']
+    assert cache.stats['evicted'] == 1
+
+
+def test_save_and_reload_keeps_entries(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.check(SOURCE, page(b'<a>v1</a>', headers={'ETag': '"abc"'}))
+    cache.save()
+    reloaded = make_cache(tmp_path)
+    assert reloaded.conditional_headers(SOURCE) == {'If-None-Match': '"abc"'}
+    assert reloaded.check(SOURCE, page(b'<a>v1</a>')) == ResponseCache.UNCHANGED
+    assert reloaded.totals['changed'] == 1
@@ -0,0 +1,52 @@
+import os
+
+from llm_cache import LLMResultCache, cache_key, normalize_content
+
+BODY = """UP Police Constable Recruitment 2026
+Total Posts: 19220
+
+--- EXTRACTED LINKS ---
+"Apply Online": "https://uppbpb.gov.in/apply"
+"Download Notification": "{mirror}/pdf/up-police-2026.pdf"
+"""
+
+
+def consolidated(mirror, date='2026-01-10'):
+    return (f"IMPORTANT CONTEXT: Today's date is {date}. Use this for the 'creation_date' field.\n\n"
+            f"\n--- Source: {mirror}/up-police-constable-2026/ ---\n\n" + BODY.format(mirror=mirror))
+
+
+def key(content):
+    return cache_key(content, 'PROMPT', 'gemini-2.5-flash-lite')
+
+
+def test_date_line_does_not_change_the_key():
+    assert key(consolidated('https://sarkariresult.com.cm', '2026-01-10')) == key(consolidated('https://sarkariresult.com.cm', '2026-02-11'))
+
+
+def test_same_text_on_another_mirror_has_the_same_key():
+    assert key(consolidated('https://sarkariresult.com.cm')) == key(consolidated('https://www.rojgarresult.com'))
+    assert 'rojgarresult' not in normalize_content(consolidated('https://www.rojgarresult.com'))
+
+
+def test_official_links_and_body_still_count():
+    original = consolidated('https://sarkariresult.com.cm')
+    assert key(original.replace('uppbpb.gov.in', 'upsssc.gov.in')) != key(original)
+    assert key(original.replace('19220', '19221')) != key(original)
+
+
+def test_whitespace_prompt_and_model_handling():
+    original = consolidated('https://sarkariresult.com.cm')
+    assert key(original.replace('Total Posts: 19220', '  Total   Posts:  19220 \n\n')) == key(original)
+    assert cache_key(original, 'OTHER PROMPT', 'gemini-2.5-flash-lite') != key(original)
+    assert cache_key(original, 'PROMPT', 'fake') != key(original)
+
+
+def test_cache_round_trip(tmp_path):
+    cache_dir = os.path.join(tmp_path, 'llm_cache')
+    cache = LLMResultCache(cache_dir)
+    cache_key_value = key(consolidated('https://sarkariresult.com.cm'))
+    assert cache.get(cache_key_value) is None
+    cache.put(cache_key_value, {'id': 'up-police-2026'})
+    cache.save()
+    assert LLMResultCache(cache_dir).get(key(consolidated('https://www.rojgarresult.com'))) == {'id': 'up-police-2026'}
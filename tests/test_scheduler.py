@@ -0,0 +1,49 @@
+import os
+
+import scraper
+from scheduler import SourceScheduler
+
+SOURCE = 'https://sarkariresult.com.cm/'
+RUN_DELAYS = [5 * 60, 25 * 60, 0, 40 * 60, 10 * 60]  # Actions starts cron jobs late, by a varying amount.
+
+
+def cron_scheduler(tmp_path):
+    return SourceScheduler(os.path.join(tmp_path, 'scheduler_state.json'), min_interval=900, max_interval=scraper.SCHEDULER_MAX_INTERVAL_SECONDS,
+                           max_backoff=scraper.SCHEDULER_MAX_BACKOFF_SECONDS, due_slack=scraper.ONCE_RUN_INTERVAL_SECONDS // 2)
+
+
+def simulate_runs(scheduler, runs, new_links):
+    """Polled run numbers for one source over `runs` cron ticks; new_links is None for a failing source."""
+    polled = []
+    for run in range(runs):
+        started = 1_700_000_000 + run * scraper.ONCE_RUN_INTERVAL_SECONDS + RUN_DELAYS[run % len(RUN_DELAYS)]
+        scheduler.sync([SOURCE], started)
+        if SOURCE not in scheduler.due(started): continue
+        polled.append(run)
+        if new_links is None: scheduler.record_failure(SOURCE, started)
+        else: scheduler.record_success(SOURCE, new_links, started)
+    return polled
+
+
+def test_quiet_source_is_polled_on_every_cron_run(tmp_path):
+    assert simulate_runs(cron_scheduler(tmp_path), 8, new_links=0) == list(range(8))
+
+
+def test_failing_source_backs_off_across_cron_runs(tmp_path):
+    polled = simulate_runs(cron_scheduler(tmp_path), 16, new_links=None)
+    assert polled == [0, 1, 2, 3, 6, 10, 14]  # Backoff of 2, 4, 8, 16 h, then capped at the 24 h max_backoff.
+
+
+def test_due_sources_keep_the_links_file_order(tmp_path):
+    scheduler = cron_scheduler(tmp_path)
+    urls = ['https://sarkariresult.com.cm/', 'https://rojgarresult.com/', 'https://sarkariresult.com.im/']
+    scheduler.sync(urls, 1_700_000_000)
+    scheduler.record_success(urls[0], 0, 1_700_000_000)  # Polled last, so due last.
+    scheduler.record_success(urls[2], 4, 1_700_000_000 - 3600)
+    later = 1_700_000_000 + scraper.SCHEDULER_MAX_INTERVAL_SECONDS
+    assert scheduler.sources[urls[0]]['next_due'] > scheduler.sources[urls[2]]['next_due']
+    assert scheduler.due(later) == urls
+    scheduler.save()
+    reloaded = cron_scheduler(tmp_path)
+    reloaded.sync(list(reversed(urls)), later)
+    assert reloaded.due(later) == list(reversed(urls))
@@ -0,0 +1,84 @@
+import pytest
+
+from content_store import ARCHIVE_KEY, empty_data
+from search_index import SearchIndex, ShardedSearchIndex, build_search_index, phonetic_key
+
+
+def post(post_id, title, **details):
+    return {'id': post_id, 'title': title, 'last_date': '2026-03-01', 'details': details}
+
+
+def sample_data():
+    data = empty_data()
+    data['latest_jobs'] = [
+        post('up-police-bharti-2026', 'UP Police Constable Bharti 2026', post_name='UP Police Constable',
+             post_subtitle='Uttar Pradesh Police Recruitment Board'),
+        post('bharat-electronics-2026', 'Bharat Electronics Engineer Recruitment 2026', post_name='BEL Engineer'),
+        post('ssc-gd-2026', 'SSC GD Constable Online Form 2026', at_a_glance_summary={'Organization': 'Staff Selection Commission'}),
+    ]
+    data['admit_card'] = [post('bihar-police-admit-card-2026', 'Bihar Police Constable Admit Card 2026',
+                               vacancy_details={'breakdown': [{'State': 'Bihar', 'Total Posts': '100'}]})]
+    data[ARCHIVE_KEY]['latest_jobs'] = [post('rajasthan-police-bharati-2024', 'Rajasthan Police Bharati 2024')]
+    return data
+
+
+@pytest.fixture
+def indexes(tmp_path):
+    data = sample_data()
+    build_search_index(data, str(tmp_path))
+    return SearchIndex.from_data(data), ShardedSearchIndex(str(tmp_path))
+
+
+def ids(results):
+    return [result['id'] for result in results]
+
+
+@pytest.mark.parametrize('spelling', ['bharti', 'bharati', 'bharthi'])
+def test_hindi_spellings_share_a_phonetic_key(spelling):
+    assert phonetic_key(spelling) == phonetic_key('bharti')
+    assert phonetic_key(spelling) != phonetic_key('bharat')
+
+
+@pytest.mark.parametrize('query', ['police', 'bharti', 'bharati', 'bharthi', 'bharat', 'constable 2026', 'staff selection', 'bihar',
+                                   'admit card', 'engin', 'cons', 'nothing matches this'])
+def test_sharded_index_returns_the_same_results(indexes, query):
+    in_memory, sharded = indexes
+    assert sharded.search(query) == in_memory.search(query)
+
+
+@pytest.mark.parametrize('spelling', ['bharti', 'bharati', 'bharthi'])
+def test_bharti_spellings_find_recruitment_posts_not_bharat(indexes, spelling):
+    for index in indexes:
+        assert set(ids(index.search(spelling))) == {'up-police-bharti-2026', 'rajasthan-police-bharati-2024'}
+
+
+def test_bharat_does_not_match_bharti(indexes):
+    for index in indexes:
+        # 'bharati' still starts with 'bharat', so type-ahead finds it, below the exact match; 'bharti' must not match.
+        assert ids(index.search('bharat')) == ['bharat-electronics-2026', 'rajasthan-police-bharati-2024']
+        assert ids(index.search('bharat electronics')) == ['bharat-electronics-2026']
+
+
+def test_every_word_must_match_and_last_word_is_a_prefix(indexes):
+    for index in indexes:
+        assert ids(index.search('police constable')) == ['up-police-bharti-2026', 'bihar-police-admit-card-2026']
+        assert ids(index.search('electronics engin')) == ['bharat-electronics-2026']
+        assert index.search('police electronics') == []
+
+
+def test_archived_posts_rank_lower_and_can_be_excluded(indexes):
+    for index in indexes:
+        results = index.search('police')
+        assert results[-1]['id'] == 'rajasthan-police-bharati-2024' and results[-1]['archived']
+        assert 'rajasthan-police-bharati-2024' not in ids(index.search('police', include_archived=False))
+
+
+def test_doc_numbers_stay_stable_across_builds(tmp_path):
+    data = sample_data()
+    build_search_index(data, str(tmp_path))
+    before = ShardedSearchIndex(str(tmp_path)).doc_numbers()
+    data['latest_jobs'].insert(0, post('new-post-2026', 'New Teacher Recruitment 2026'))
+    build_search_index(data, str(tmp_path))
+    after = ShardedSearchIndex(str(tmp_path)).doc_numbers()
+    assert {post_id: after[post_id] for post_id in before} == before
+    assert after['new-post-2026'] == max(before.values()) + 1
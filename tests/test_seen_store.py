@@ -0,0 +1,82 @@
+import os
+import shutil
+
+import pytest
+
+from seen_store import HEADER, SeenUrlStore, canonicalize_url
+
+ALIASES = {'sarkariresult.com.im': 'sarkariresult.com.cm'}
+REPO_SEEN_URLS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'seen_urls.txt')
+
+
+@pytest.mark.parametrize('variant', [
+    'https://sarkariresult.com.cm/up-police-2026/',
+    'http://sarkariresult.com.cm/up-police-2026',
+    'https://www.sarkariresult.com.cm/up-police-2026/',
+    'https://SarkariResult.com.cm:443/up-police-2026//',
+    'http://sarkariresult.com.cm:80/up-police-2026/#apply',
+    'https://sarkariresult.com.cm/up-police-2026/?utm_source=telegram&utm_medium=social&fbclid=abc',
+    'https://sarkariresult.com.im/up-police-2026/',
+    '  https://www.sarkariresult.com.im/up-police-2026/?ref=home\n',
+])
+def test_url_variants_share_one_key(variant):
+    assert canonicalize_url(variant, ALIASES) == 'sarkariresult.com.cm/up-police-2026'
+
+
+def test_real_query_parameters_are_kept_and_sorted():
+    assert canonicalize_url('https://example.com/post/?page=2&id=7&utm_campaign=x') == 'example.com/post?id=7&page=2'
+    assert canonicalize_url('https://example.com:8080/post/') == 'example.com:8080/post'
+    assert canonicalize_url('https://sarkariresult.com.im/post/') == 'sarkariresult.com.im/post'  # No aliases given.
+
+
+def test_committed_seen_urls_file_is_migrated(tmp_path):
+    path = os.path.join(tmp_path, 'seen_urls.txt')
+    shutil.copyfile(REPO_SEEN_URLS, path)
+    with open(REPO_SEEN_URLS, encoding='utf-8') as f: legacy = [line.strip() for line in f if line.strip()]
+    store = SeenUrlStore(path, host_aliases=ALIASES)
+    assert all(url in store for url in legacy)
+    with open(path, 'rb') as f:
+        assert f.readline() == HEADER
+        keys = f.read().splitlines()
+    assert keys == sorted(set(keys)) and len(store) == len(keys)
+    store.close()
+    assert len(SeenUrlStore(path, host_aliases=ALIASES)) == len(keys)  # Already migrated: loaded as is.
+
+
+@pytest.mark.parametrize('use_bloom', [True, False])
+def test_record_flush_and_reload(tmp_path, use_bloom):
+    path = os.path.join(tmp_path, 'seen_urls.txt')
+    store = SeenUrlStore(path, host_aliases=ALIASES, use_bloom=use_bloom)
+    urls = [f"https://sarkariresult.com.cm/post-{i:03d}/" for i in range(50)]
+    for url in urls: store.record(url)
+    store.record('https://sarkariresult.com.im/post-000/')  # Same key as the first post.
+    assert store.flush() == 50 and store.flush() == 0
+    store.close()
+
+    reloaded = SeenUrlStore(path, host_aliases=ALIASES, use_bloom=use_bloom)
+    with open(path, 'rb') as f: keys = f.read().splitlines()[1:]
+    assert keys[0] == b'sarkariresult.com.cm/post-000' and keys[-1] == b'sarkariresult.com.cm/post-049'
+    assert 'https://www.sarkariresult.com.cm/post-000/?utm_source=x' in reloaded  # First line.
+    assert 'http://sarkariresult.com.im/post-049' in reloaded  # Last line.
+    assert all(url in reloaded for url in urls)
+    for missing in ['https://sarkariresult.com.cm/post-', 'https://sarkariresult.com.cm/post-0500/',
+                    'https://aaa.com/', 'https://zzz.com/']:
+        assert missing not in reloaded
+
+    reloaded.record('https://aaa.com/first/')
+    reloaded.record('https://zzz.com/last/')
+    reloaded.record(urls[10])  # Already on disk: not pending again.
+    assert reloaded.flush() == 2
+    assert 'https://aaa.com/first' in reloaded and 'https://zzz.com/last' in reloaded and urls[10] in reloaded
+    assert len(reloaded) == 52
+    reloaded.close()
+
+
+def test_add_lasts_only_for_the_cycle(tmp_path):
+    path = os.path.join(tmp_path, 'seen_urls.txt')
+    store = SeenUrlStore(path)
+    store.add('https://example.com/skipped/')
+    assert 'https://example.com/skipped' in store
+    assert store.flush() == 0
+    store.close()
+    assert 'https://example.com/skipped' not in SeenUrlStore(path)
@@ -0,0 +1,67 @@
+import json
+import os
+
+import site_build
+from content_store import ARCHIVE_KEY, empty_data
+from site_build import build_static_shards, render_shards
+
+
+def job(post_id):
+    return {'id': post_id, 'title': post_id.replace('-', ' ').title(), 'last_date': '2026-03-01', 'new': True,
+            'details': {'post_name': post_id}}
+
+
+def sample_data():
+    data = empty_data()
+    data['latest_jobs'] = [job('ssc-gd-2026'), job('up-police-2026')]
+    data['result'] = [job('rrb-ntpc-result-2025')]
+    return data
+
+
+def record_writes(monkeypatch):
+    written = []
+    original = site_build._write_atomic
+    monkeypatch.setattr(site_build, '_write_atomic', lambda path, payload: (written.append(path), original(path, payload)))
+    return written
+
+
+def test_shards_hold_list_fields_and_full_posts(tmp_path):
+    out_dir = str(tmp_path)
+    build_static_shards(sample_data(), out_dir)
+    with open(os.path.join(out_dir, 'index', 'latest_jobs.json'), encoding='utf-8') as f: listing = json.load(f)
+    assert listing == [{'id': 'ssc-gd-2026', 'title': 'Ssc Gd 2026', 'last_date': '2026-03-01', 'new': True},
+                       {'id': 'up-police-2026', 'title': 'Up Police 2026', 'last_date': '2026-03-01', 'new': True}]
+    with open(os.path.join(out_dir, 'posts', 'up-police-2026.json'), encoding='utf-8') as f: assert json.load(f) == job('up-police-2026')
+    assert os.path.exists(os.path.join(out_dir, 'posts', 'up-police-2026.json.gz'))
+
+
+def test_unchanged_shards_are_not_rewritten(tmp_path, monkeypatch):
+    out_dir = str(tmp_path)
+    build_static_shards(sample_data(), out_dir)
+    written = record_writes(monkeypatch)
+    assert build_static_shards(sample_data(), out_dir) == (0, 0)
+    assert written == []
+
+
+def test_archived_posts_lose_their_shards(tmp_path, monkeypatch):
+    out_dir = str(tmp_path)
+    build_static_shards(sample_data(), out_dir)
+    data = sample_data()
+    archived = data['latest_jobs'].pop(0)
+    data[ARCHIVE_KEY]['latest_jobs'] = [archived]
+    written = record_writes(monkeypatch)
+    # The latest_jobs list and the home index change; the archived post's shard goes.
+    assert build_static_shards(data, out_dir) == (2, 1)
+    assert not any(os.path.exists(os.path.join(out_dir, 'posts', 'ssc-gd-2026.json' + suffix)) for suffix in ('', '.gz', '.br'))
+    assert os.path.exists(os.path.join(out_dir, 'posts', 'up-police-2026.json'))
+    assert not any(os.path.relpath(path, out_dir).startswith('posts') for path in written)
+    with open(os.path.join(out_dir, site_build.MANIFEST_NAME), encoding='utf-8') as f: manifest = json.load(f)
+    assert sorted(manifest) == sorted(render_shards(data))
+
+
+def test_missing_variant_is_rewritten(tmp_path):
+    out_dir = str(tmp_path)
+    build_static_shards(sample_data(), out_dir)
+    os.remove(os.path.join(out_dir, 'posts', 'ssc-gd-2026.json.gz'))
+    assert build_static_shards(sample_data(), out_dir) == (1, 0)
+    assert os.path.exists(os.path.join(out_dir, 'posts', 'ssc-gd-2026.json.gz'))